@@ -111,3 +111,11 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Maximum number of books nested in each author by the API (most recent first);
+# the rest are reachable through the author's books_url.
+AUTHOR_BOOKS_LIMIT = 10
+
+# Days deletions are kept in the API change feed; clients whose cursor is
+# older than the oldest kept deletion must resync from scratch.
+CHANGE_FEED_RETENTION_DAYS = 30
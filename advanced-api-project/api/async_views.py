@@ -0,0 +1,313 @@
+"""
+Async-native variants of the Book/Author API views for ASGI deployments.
+
+Under ASGI the regular views each occupy a worker thread for the whole
+request. These views run on the event loop instead. They use Django's
+async ORM (aget/acreate/asave/adelete/aiterator) and resolve the session
+user with ``auser()``, and they only leave the loop for code that is
+inherently synchronous: serializer validation (related-field lookups),
+Basic authentication and the author cascade delete.
+
+Filtering, search, ordering, pagination and permissions behave as in
+api.views, with two exceptions. The author filter matches ids without
+validating them (see BookFilterSet). List responses are not cached,
+because the cache's single-flight wait blocks.
+"""
+import inspect
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.db.models import aprefetch_related_objects
+from django.http import Http404
+from django_filters import rest_framework
+from rest_framework import filters, generics, mixins, status
+from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .filters import BookFilterSet
+from .mixins import FastListMixin, QuerySetOptimizerMixin, plan_queryset
+from .models import Author, Book
+from .pagination import BookCursorPagination
+from .renderers import API_RENDERER_CLASSES
+from .search import BookSearchFilter
+from .serializers import AuthorSerializer, BookSerializer
+from .views import delete_author
+
+
+class AsyncAPIView(APIView):
+    """
+    APIView whose dispatch is a coroutine; handlers may be sync or async.
+    """
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.ainitial(request, *args, **kwargs)
+            handler = getattr(self, request.method.lower(), None)
+            if request.method.lower() not in self.http_method_names or handler is None:
+                handler = self.http_method_not_allowed
+            response = handler(request, *args, **kwargs)
+            if inspect.isawaitable(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def ainitial(self, request, *args, **kwargs):
+        await self.aperform_authentication(request)
+        # Everything else initial() does is free of queries now.
+        self.initial(request, *args, **kwargs)
+
+    async def aperform_authentication(self, request):
+        """
+        Resolve the session user without blocking, so SessionAuthentication
+        reads an already-loaded user. Credentials in an Authorization header
+        are checked against the database synchronously, in a thread.
+        """
+        request._request.user = await request._request.auser()
+        if request.META.get('HTTP_AUTHORIZATION'):
+            await sync_to_async(self.perform_authentication)(request)
+
+    async def options(self, request, *args, **kwargs):
+        # The metadata may build serializers and look up the object.
+        return await sync_to_async(super().options)(request, *args, **kwargs)
+
+
+class AsyncGenericAPIView(AsyncAPIView, generics.GenericAPIView):
+    """
+    GenericAPIView with async object lookup and pagination.
+    """
+    iterator_chunk_size = 2000
+
+    async def aget_object(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        filter_kwargs = {self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        try:
+            obj = await queryset.aget(**filter_kwargs)
+        except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    async def apaginate_queryset(self, queryset):
+        if self.paginator is None:
+            return None
+        return await self.paginator.apaginate_queryset(queryset, self.request, view=self)
+
+    async def aprefetch_for_response(self, instance):
+        """
+        Load the relations the serializer reads, which writes do not
+        eager-load, so rendering the response never queries lazily.
+        """
+        select_related, prefetches, _ = plan_queryset(self.get_serializer(), type(instance))
+        if select_related or prefetches:
+            await aprefetch_related_objects([instance], *select_related, *prefetches)
+
+
+class AsyncListModelMixin:
+    """
+    List a queryset, through FastReadSerializer when the view offers it.
+    """
+    async def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        fast = self.get_fast_serializer() if hasattr(self, 'get_fast_serializer') else None
+        if fast is not None:
+            queryset = fast.values(queryset)
+
+        page = await self.apaginate_queryset(queryset)
+        rows = page
+        if rows is None:
+            rows = [row async for row in queryset.aiterator(chunk_size=self.iterator_chunk_size)]
+        data = fast.many(rows) if fast is not None else self.get_serializer(rows, many=True).data
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+
+class AsyncRetrieveModelMixin:
+    """
+    Retrieve a model instance.
+    """
+    async def retrieve(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        return Response(self.get_serializer(instance).data)
+
+
+class AsyncCreateModelMixin(mixins.CreateModelMixin):
+    """
+    Create a model instance.
+    """
+    async def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        await sync_to_async(serializer.is_valid)(raise_exception=True)
+        await self.aperform_create(serializer)
+        await self.aprefetch_for_response(serializer.instance)
+        headers = self.get_success_headers(serializer.data)
+        return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
+
+    async def aperform_create(self, serializer):
+        model = serializer.Meta.model
+        serializer.instance = await model._default_manager.acreate(**serializer.validated_data)
+
+
+class AsyncUpdateModelMixin:
+    """
+    Update a model instance.
+    """
+    async def update(self, request, *args, **kwargs):
+        partial = kwargs.pop('partial', False)
+        instance = await self.aget_object()
+        serializer = self.get_serializer(instance, data=request.data, partial=partial)
+        await sync_to_async(serializer.is_valid)(raise_exception=True)
+        await self.aperform_update(serializer)
+        await self.aprefetch_for_response(serializer.instance)
+        return Response(serializer.data)
+
+    async def partial_update(self, request, *args, **kwargs):
+        kwargs['partial'] = True
+        return await self.update(request, *args, **kwargs)
+
+    async def aperform_update(self, serializer):
+        instance = serializer.instance
+        for attr, value in serializer.validated_data.items():
+            setattr(instance, attr, value)
+        await instance.asave()
+
+
+class AsyncDestroyModelMixin:
+    """
+    Destroy a model instance.
+    """
+    async def destroy(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        await self.aperform_destroy(instance)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    async def aperform_destroy(self, instance):
+        await instance.adelete()
+
+
+# Book views
+class AsyncBookListView(AsyncListModelMixin, FastListMixin, QuerySetOptimizerMixin, AsyncGenericAPIView):
+    """
+    Async BookListView: cursor-paginated, filterable, searchable and orderable.
+    """
+    queryset = Book.objects.all()
+    serializer_class = BookSerializer
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    renderer_classes = API_RENDERER_CLASSES
+    pagination_class = BookCursorPagination
+    filter_backends = [rest_framework.DjangoFilterBackend, BookSearchFilter, filters.OrderingFilter]
+    filterset_class = BookFilterSet
+    search_fields = ['title', 'author__name']
+    ordering_fields = ['title', 'publication_year']
+    query_budget = 2
+
+    async def get(self, request, *args, **kwargs):
+        return await self.list(request, *args, **kwargs)
+
+class AsyncBookDetailView(AsyncRetrieveModelMixin, QuerySetOptimizerMixin, AsyncGenericAPIView):
+    """
+    Async BookDetailView.
+    """
+    queryset = Book.objects.all()
+    serializer_class = BookSerializer
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    renderer_classes = API_RENDERER_CLASSES
+    query_budget = 1
+
+    async def get(self, request, *args, **kwargs):
+        return await self.retrieve(request, *args, **kwargs)
+
+class AsyncBookCreateView(AsyncCreateModelMixin, AsyncGenericAPIView):
+    """
+    Async BookCreateView. Restricted to authenticated users.
+    """
+    queryset = Book.objects.all()
+    serializer_class = BookSerializer
+    permission_classes = [IsAuthenticated]
+    renderer_classes = API_RENDERER_CLASSES
+    query_budget = 7
+
+    async def post(self, request, *args, **kwargs):
+        return await self.create(request, *args, **kwargs)
+
+class AsyncBookUpdateView(AsyncUpdateModelMixin, AsyncGenericAPIView):
+    """
+    Async BookUpdateView. Restricted to authenticated users.
+    """
+    queryset = Book.objects.all()
+    serializer_class = BookSerializer
+    permission_classes = [IsAuthenticated]
+    renderer_classes = API_RENDERER_CLASSES
+    query_budget = {'PUT': 8, 'PATCH': 8}
+
+    async def put(self, request, *args, **kwargs):
+        return await self.update(request, *args, **kwargs)
+
+    async def patch(self, request, *args, **kwargs):
+        return await self.partial_update(request, *args, **kwargs)
+
+class AsyncBookDeleteView(AsyncDestroyModelMixin, AsyncGenericAPIView):
+    """
+    Async BookDeleteView. Restricted to authenticated users.
+    """
+    queryset = Book.objects.all()
+    serializer_class = BookSerializer
+    permission_classes = [IsAuthenticated]
+    renderer_classes = API_RENDERER_CLASSES
+    query_budget = 6
+
+    async def delete(self, request, *args, **kwargs):
+        return await self.destroy(request, *args, **kwargs)
+
+# Author views
+class AsyncAuthorList(AsyncListModelMixin, AsyncCreateModelMixin, QuerySetOptimizerMixin, AsyncGenericAPIView):
+    """
+    Async AuthorList; nested books are prefetched in one query.
+    """
+    queryset = Author.objects.all()
+    serializer_class = AuthorSerializer
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    renderer_classes = API_RENDERER_CLASSES
+    query_budget = {'GET': 2, 'POST': 4}
+
+    async def get(self, request, *args, **kwargs):
+        return await self.list(request, *args, **kwargs)
+
+    async def post(self, request, *args, **kwargs):
+        return await self.create(request, *args, **kwargs)
+
+class AsyncAuthorDetail(AsyncRetrieveModelMixin, AsyncUpdateModelMixin, AsyncDestroyModelMixin,
+                        QuerySetOptimizerMixin, AsyncGenericAPIView):
+    """
+    Async AuthorDetail.
+    """
+    queryset = Author.objects.all()
+    serializer_class = AuthorSerializer
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    renderer_classes = API_RENDERER_CLASSES
+    query_budget = {'GET': 2, 'PUT': 6, 'PATCH': 6, 'DELETE': 12}
+
+    async def get(self, request, *args, **kwargs):
+        return await self.retrieve(request, *args, **kwargs)
+
+    async def put(self, request, *args, **kwargs):
+        return await self.update(request, *args, **kwargs)
+
+    async def patch(self, request, *args, **kwargs):
+        return await self.partial_update(request, *args, **kwargs)
+
+    async def delete(self, request, *args, **kwargs):
+        return await self.destroy(request, *args, **kwargs)
+
+    async def aperform_destroy(self, instance):
+        await sync_to_async(delete_author)(instance)
@@ -0,0 +1,139 @@
+"""
+Helpers shared by the benchmarking management commands.
+"""
+import math
+import subprocess
+import time
+import tracemalloc
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .models import Author, Book
+
+SEED_BATCH_SIZE = 2000
+
+
+def seed_books(count, authors=100):
+    """
+    Bulk-insert ``count`` books spread over ``authors`` new authors. Meant to
+    run inside a transaction that the caller rolls back, or against a
+    throwaway database. Signals are not sent, so callers that need the
+    search index must rebuild it.
+    """
+    created = Author.objects.bulk_create(Author(name='Bench Author %d' % i) for i in range(authors))
+    for start in range(0, count, SEED_BATCH_SIZE):
+        Book.objects.bulk_create(
+            Book(
+                title='Bench Book %d' % i,
+                author=created[i % authors],
+                publication_year=1900 + i % 120,
+            )
+            for i in range(start, min(start + SEED_BATCH_SIZE, count))
+        )
+    return created
+
+
+def best_of(func, repeat=3):
+    """
+    Run ``func`` ``repeat`` times and return the fastest wall-clock time
+    in seconds together with the last result.
+    """
+    best, result = None, None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def percentile(samples, pct):
+    """
+    Nearest-rank percentile of ``samples`` (which need not be sorted).
+    """
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def git_commit():
+    """
+    The commit the working tree is at, or None outside a git checkout.
+    """
+    try:
+        result = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+class Scenario:
+    """
+    One benchmarked request against a named route.
+
+    ``build`` is called before every request, outside the timed section,
+    and returns ``(url, data)`` for that request; it is where a scenario
+    picks a fresh object to delete or clears a cache it wants to miss.
+    """
+    def __init__(self, name, route, method, build, authenticated=False):
+        self.name = name
+        self.route = route
+        self.method = method
+        self.build = build
+        self.authenticated = authenticated
+
+    def request(self, client, url, data):
+        return getattr(client, self.method.lower())(url, data, format='json')
+
+
+def measure(scenario, client, requests, profile_requests):
+    """
+    Time ``requests`` requests for ``scenario``, then replay
+    ``profile_requests`` more to count queries and trace peak memory;
+    profiling is kept out of the timed runs because both hooks add
+    overhead of their own.
+    """
+    timings = []
+    for _ in range(requests):
+        url, data = scenario.build()
+        started = time.perf_counter()
+        response = scenario.request(client, url, data)
+        timings.append((time.perf_counter() - started) * 1000)
+        if response.status_code >= 400:
+            raise RuntimeError('%s returned %d: %r' % (scenario.name, response.status_code, response.content[:200]))
+
+    query_counts, peaks = [], []
+    for _ in range(profile_requests):
+        url, data = scenario.build()
+        with CaptureQueriesContext(connection) as queries:
+            scenario.request(client, url, data)
+        query_counts.append(len(queries.captured_queries))
+
+        url, data = scenario.build()
+        tracemalloc.start()
+        try:
+            scenario.request(client, url, data)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+        finally:
+            tracemalloc.stop()
+
+    return {
+        'route': scenario.route,
+        'method': scenario.method,
+        'requests': requests,
+        'latency_ms': {
+            'mean': round(sum(timings) / len(timings), 3),
+            'p50': round(percentile(timings, 50), 3),
+            'p95': round(percentile(timings, 95), 3),
+            'p99': round(percentile(timings, 99), 3),
+        },
+        'queries': {
+            'min': min(query_counts),
+            'max': max(query_counts),
+            'mean': round(sum(query_counts) / len(query_counts), 2),
+        } if query_counts else None,
+        'peak_memory_kb': round(max(peaks) / 1024, 1) if peaks else None,
+    }
@@ -0,0 +1,91 @@
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.http import urlencode
+
+# Bumped on every Book/Author write; part of every cached list key, so a
+# bump orphans all earlier entries without scanning or deleting keys.
+GENERATION_KEY = 'api:books:generation'
+# How long a single-flight leader may hold the lock, and how long the
+# other requests for the same key wait for it before querying themselves.
+LOCK_TIMEOUT = 30
+WAIT_TIMEOUT = 10
+POLL_INTERVAL = 0.05
+
+_MISSING = object()
+
+
+def get_generation():
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        # Seed from the clock rather than 1, so an evicted counter can never
+        # come back to a value that older entries were stored under.
+        cache.add(GENERATION_KEY, time.time_ns())
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def bump_generation():
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.add(GENERATION_KEY, time.time_ns())
+
+
+def invalidate_book_lists():
+    """
+    Invalidate every cached Book list response.
+
+    Bumps now (so this connection stops reading stale entries) and again on
+    commit (so entries that another request filled from the pre-commit data
+    in between are dropped too).
+    """
+    bump_generation()
+    transaction.on_commit(bump_generation)
+
+
+def make_list_key(request, prefix='api:books:list'):
+    """
+    Key a list response on the generation, the auth state and the URL with
+    its query string normalized (parameter and value order ignored).
+    """
+    params = sorted((key, sorted(values)) for key, values in request.query_params.lists())
+    url = request.build_absolute_uri(request.path) + '?' + urlencode(params, doseq=True)
+    auth = 'auth' if request.user and request.user.is_authenticated else 'anon'
+    digest = hashlib.md5(url.encode('utf-8'), usedforsecurity=False).hexdigest()
+    return '%s:%s:%s:%s' % (prefix, get_generation(), auth, digest)
+
+
+def single_flight(key, compute, timeout):
+    """
+    Return the cached value for ``key``, computing and caching it on a miss.
+
+    Only one caller at a time computes a given key (the lock is a cache.add,
+    so this holds across processes sharing the cache). The others poll for
+    the leader's result and only compute it themselves if the leader fails
+    or takes longer than WAIT_TIMEOUT.
+    """
+    value = cache.get(key, _MISSING)
+    if value is not _MISSING:
+        return value
+
+    lock_key = key + ':lock'
+    if cache.add(lock_key, True, LOCK_TIMEOUT):
+        try:
+            value = compute()
+            cache.set(key, value, timeout)
+        finally:
+            cache.delete(lock_key)
+        return value
+
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        value = cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        if not cache.get(lock_key):
+            break
+    return compute()
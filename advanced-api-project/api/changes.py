@@ -0,0 +1,72 @@
+"""
+Change log behind the change feed (api.views.ChangeFeedView).
+
+Every insert, update and delete of a Book or Author is recorded as a Change.
+The log is compacted as it is written: recording a change first drops the
+object's earlier entries, so a client replaying the feed sees only the latest
+state of each object and the log never grows beyond one entry per object
+plus the tombstones of deleted ones. Tombstones are trimmed once they are
+older than CHANGE_FEED_RETENTION_DAYS; ChangeHorizon remembers how far
+trimming has gone, so a client whose cursor is older than that is told to
+resync instead of silently missing deletions.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import Author, Book, Change, ChangeHorizon
+
+RESOURCES = {Book: 'book', Author: 'author'}
+
+# Object ids per compaction statement, to stay under SQLite's variable limit.
+CHUNK_SIZE = 500
+
+
+def record_changes(model, ids, action):
+    """
+    Record ``action`` for every id of ``model``, replacing earlier entries.
+    """
+    resource = RESOURCES[model]
+    ids = list(dict.fromkeys(ids))
+    now = timezone.now()
+    with transaction.atomic(savepoint=False):
+        for start in range(0, len(ids), CHUNK_SIZE):
+            chunk = ids[start:start + CHUNK_SIZE]
+            Change.objects.filter(resource=resource, object_id__in=chunk).delete()
+            Change.objects.bulk_create(
+                Change(resource=resource, object_id=pk, action=action, changed_at=now) for pk in chunk
+            )
+
+
+def get_horizon():
+    """
+    Return the id of the newest trimmed tombstone (0 if none were trimmed).
+    """
+    return ChangeHorizon.objects.filter(pk=1).values_list('last_trimmed_id', flat=True).first() or 0
+
+
+def trim_changes(retention_days=None):
+    """
+    Drop tombstones older than the retention period and return the horizon.
+    """
+    if retention_days is None:
+        retention_days = getattr(settings, 'CHANGE_FEED_RETENTION_DAYS', 30)
+    expired = Change.objects.filter(action=Change.DELETED, changed_at__lt=timezone.now() - timedelta(days=retention_days))
+    last_id = expired.aggregate(last_id=Max('id'))['last_id']
+    if last_id is None:
+        return get_horizon()
+    with transaction.atomic():
+        expired.filter(id__lte=last_id).delete()
+        ChangeHorizon.objects.update_or_create(pk=1, defaults={'last_trimmed_id': last_id})
+    return last_id
+
+
+def head():
+    """
+    Return the cursor to follow the feed from now on: the newest change, or
+    the horizon if trimming removed every later entry (0 if neither exists).
+    """
+    return max(Change.objects.aggregate(head=Max('id'))['head'] or 0, get_horizon())
@@ -0,0 +1,127 @@
+import itertools
+from urllib import parse
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.models import Author, Book
+from api.views import BookListView
+
+# Sample values used for every filter; plans do not depend on them.
+SAMPLE_FILTERS = {'title': 'sample', 'publication_year': '2000'}
+SAMPLE_SEARCH = 'sample'
+SAMPLE_POSITION = {'id': 1, 'title': 'sample', 'publication_year': 2000, 'search_rank': 0.0}
+
+
+class Command(BaseCommand):
+    help = (
+        'Run EXPLAIN QUERY PLAN for every filter/search/ordering combination '
+        'BookListView allows (first page and a deep cursor page) and flag '
+        'any that fall back to a full table scan.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--no-fail', action='store_true',
+            help='Report flagged plans without exiting with an error.',
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('EXPLAIN QUERY PLAN auditing is only implemented for SQLite.')
+
+        verbosity = options['verbosity']
+        flagged = []
+        total = 0
+        with transaction.atomic():
+            # The author filter validates the id, so make sure one exists.
+            author = Author.objects.first() or Author.objects.create(name='audit')
+            for params, deep in self.combinations(author.pk):
+                total += 1
+                sql, sql_params = self.page_query(params, deep)
+                plan = self.explain(sql, sql_params)
+                problems = self.problems(plan, params, deep)
+                label = self.label(params, deep)
+                if problems:
+                    flagged.append(label)
+                    self.stdout.write(self.style.ERROR('FLAG  %s: %s' % (label, '; '.join(problems))))
+                elif verbosity > 1:
+                    self.stdout.write('ok    %s' % label)
+                if problems or verbosity > 2:
+                    for line in plan:
+                        self.stdout.write('        %s' % line)
+            transaction.set_rollback(True)
+
+        summary = '%d of %d query plans flagged.' % (len(flagged), total)
+        if flagged and not options['no_fail']:
+            raise CommandError(summary)
+        self.stdout.write(self.style.WARNING(summary) if flagged else self.style.SUCCESS(summary))
+
+    def combinations(self, author_id):
+        filters = dict(SAMPLE_FILTERS, author=str(author_id))
+        names = sorted(filters)
+        orderings = [None]
+        for field in BookListView.ordering_fields:
+            orderings.extend([field, '-' + field])
+        for size in range(len(names) + 1):
+            for subset in itertools.combinations(names, size):
+                for search in (False, True):
+                    for ordering in orderings:
+                        for deep in (False, True):
+                            params = {name: filters[name] for name in subset}
+                            if search:
+                                params['search'] = SAMPLE_SEARCH
+                            if ordering:
+                                params['ordering'] = ordering
+                            yield params, deep
+
+    def page_query(self, params, deep):
+        """
+        Build the exact page query BookListView would run for ``params``.
+        """
+        hosts = [host for host in settings.ALLOWED_HOSTS if host not in ('*', '')]
+        factory = APIRequestFactory(HTTP_HOST=hosts[0].lstrip('.') if hosts else 'localhost')
+        view = BookListView()
+        request = view.initialize_request(factory.get('/api/books/', params))
+        view.request, view.args, view.kwargs, view.format_kwarg = request, (), {}, None
+        queryset = view.filter_queryset(view.get_queryset())
+        paginator = view.paginator
+        page = paginator.get_page_queryset(queryset, request, view)
+        if deep:
+            position = [SAMPLE_POSITION[field.lstrip('-')] for field in paginator.ordering]
+            url = paginator.encode_cursor({'p': position, 'r': False})
+            cursor_params = dict(parse.parse_qsl(parse.urlsplit(url).query))
+            request = Request(factory.get('/api/books/', cursor_params))
+            page = paginator.get_page_queryset(queryset, request, view)
+        return page.query.sql_with_params()
+
+    def explain(self, sql, params):
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+            return [row[-1] for row in cursor.fetchall()]
+
+    def problems(self, plan, params, deep):
+        """
+        A plain SCAN of the book table is a full table scan; that is only
+        acceptable for an unfiltered first page, which stops at the LIMIT.
+        On a deep page even an index-ordered SCAN is flagged, because it
+        walks every row before the cursor instead of seeking to it.
+        """
+        table = Book._meta.db_table
+        problems = []
+        for line in plan:
+            words = line.replace('TABLE ', '').split()
+            if len(words) < 2 or words[0] != 'SCAN' or words[1].strip('"') != table:
+                continue
+            if 'INDEX' not in line and (params.keys() - {'ordering'} or deep):
+                problems.append('full table scan')
+            elif 'INDEX' in line and deep:
+                problems.append('index scan instead of a seek to the cursor')
+        return problems
+
+    def label(self, params, deep):
+        query = parse.urlencode(sorted(params.items())) or '(no parameters)'
+        return '%s [%s]' % (query, 'deep page' if deep else 'first page')
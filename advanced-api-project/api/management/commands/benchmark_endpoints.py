@@ -0,0 +1,201 @@
+import itertools
+import json
+import platform
+
+import django
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework.test import APIClient
+
+from api import search
+from api.benchmarking import Scenario, git_commit, measure, seed_books
+from api.cache import invalidate_book_lists
+from api.models import Author, Book
+from api.urls import urlpatterns
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a throwaway test database with Author/Book rows and benchmark '
+        'every named API route: p50/p95/p99 latency, queries per request and '
+        'peak memory. Results are written as JSON for comparison across commits.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--books', type=int, default=10000, help='Books to seed (default: 10000).')
+        parser.add_argument('--authors', type=int, help='Authors to seed (default: one per 10 books).')
+        parser.add_argument('--requests', type=int, default=50, help='Timed requests per scenario (default: 50).')
+        parser.add_argument(
+            '--profile-requests', type=int, default=5,
+            help='Extra requests per scenario used to count queries and trace memory (default: 5).',
+        )
+        parser.add_argument(
+            '--scenario', action='append', dest='scenarios',
+            help='Only run scenarios whose name contains this text (repeatable).',
+        )
+        parser.add_argument(
+            '--output', default='benchmark-results.json',
+            help='Where to write the JSON results (default: benchmark-results.json).',
+        )
+        parser.add_argument(
+            '--compare', metavar='PATH',
+            help='Earlier results file to print p50 latency and query deltas against.',
+        )
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1:
+            raise CommandError('--requests must be at least 1.')
+        books = options['books']
+        authors = options['authors'] or max(1, books // 10)
+
+        # Never touch the configured database: build a fresh test database,
+        # exactly as the test runner does, and drop it afterwards.
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            self.stdout.write('Seeding %d books across %d authors...' % (books, authors))
+            self.seed(books, authors)
+            results = self.run_scenarios(options)
+        except RuntimeError as exc:
+            raise CommandError(exc)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        report = {
+            'commit': git_commit(),
+            'created_at': timezone.now().isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'books': books,
+            'authors': authors,
+            'results': results,
+        }
+        with open(options['output'], 'w') as fh:
+            json.dump(report, fh, indent=2)
+        self.stdout.write(self.style.SUCCESS('Wrote %s.' % options['output']))
+        if options['compare']:
+            self.compare(options['compare'], report)
+
+    def seed(self, books, authors):
+        seed_books(books, authors)
+        if search.search_available():
+            search.rebuild_index()
+        User.objects.create_user(username='bench', password='bench')
+        cache.clear()
+
+    def scenarios(self):
+        book_ids = iter(Book.objects.order_by('-id').values_list('id', flat=True))
+        first_book = Book.objects.order_by('id').values_list('id', flat=True).first()
+        first_author = Author.objects.order_by('id').values_list('id', flat=True).first()
+        counter = itertools.count()
+
+        def fixed(url, data=None):
+            return lambda: (url, data)
+
+        def uncached(url):
+            def build():
+                invalidate_book_lists()
+                return url, None
+            return build
+
+        def deep_page():
+            # Follow the cursor a few pages in, outside the timed section.
+            url = reverse('book-list')
+            client = APIClient()
+            for _ in range(5):
+                url = client.get(url, format='json').json()['next'] or url
+            invalidate_book_lists()
+            return url, None
+
+        def new_book():
+            n = next(counter)
+            return reverse('book-create'), {'title': 'Bench New %d' % n, 'author': first_author, 'publication_year': 2000}
+
+        def rename_book():
+            n = next(counter)
+            return reverse('book-update', args=[first_book]), {'title': 'Bench Renamed %d' % n}
+
+        def delete_book():
+            return reverse('book-delete', args=[next(book_ids)]), None
+
+        def batch():
+            n = next(counter)
+            rows = [
+                {'title': 'Bench Batch %d-%d' % (n, i), 'author': first_author, 'publication_year': 2000}
+                for i in range(50)
+            ]
+            return reverse('book-batch'), rows
+
+        def rename_author():
+            n = next(counter)
+            return reverse('author-detail', args=[first_author]), {'name': 'Bench Author Renamed %d' % n}
+
+        def new_author():
+            n = next(counter)
+            return reverse('author-list'), {'name': 'Bench New Author %d' % n}
+
+        book_list = reverse('book-list')
+        return [
+            Scenario('book-list', 'book-list', 'GET', fixed(book_list)),
+            Scenario('book-list uncached', 'book-list', 'GET', uncached(book_list)),
+            Scenario('book-list filtered', 'book-list', 'GET', uncached(book_list + '?publication_year=1950&ordering=title')),
+            Scenario('book-list search', 'book-list', 'GET', uncached(book_list + '?search=bench+book+12')),
+            Scenario('book-list deep page', 'book-list', 'GET', deep_page),
+            Scenario('book-detail', 'book-detail', 'GET', fixed(reverse('book-detail', args=[first_book]))),
+            Scenario('author-list', 'author-list', 'GET', fixed(reverse('author-list'))),
+            Scenario('author-detail', 'author-detail', 'GET', fixed(reverse('author-detail', args=[first_author]))),
+            Scenario('book-create', 'book-create', 'POST', new_book, authenticated=True),
+            Scenario('book-update', 'book-update', 'PATCH', rename_book, authenticated=True),
+            Scenario('book-delete', 'book-delete', 'DELETE', delete_book, authenticated=True),
+            Scenario('book-batch', 'book-batch', 'POST', batch, authenticated=True),
+            Scenario('author-list create', 'author-list', 'POST', new_author, authenticated=True),
+            Scenario('author-detail update', 'author-detail', 'PATCH', rename_author, authenticated=True),
+        ]
+
+    def run_scenarios(self, options):
+        scenarios = self.scenarios()
+        missing = {pattern.name for pattern in urlpatterns if pattern.name} - {s.route for s in scenarios}
+        for name in sorted(missing):
+            self.stdout.write(self.style.WARNING('No benchmark scenario for route %r.' % name))
+        if options['scenarios']:
+            scenarios = [s for s in scenarios if any(text in s.name for text in options['scenarios'])]
+
+        anonymous, authenticated = APIClient(), APIClient()
+        authenticated.login(username='bench', password='bench')
+        results = {}
+        for scenario in scenarios:
+            client = authenticated if scenario.authenticated else anonymous
+            result = measure(scenario, client, options['requests'], options['profile_requests'])
+            results[scenario.name] = result
+            self.stdout.write(
+                '%-24s p50 %8.2fms  p95 %8.2fms  p99 %8.2fms  queries %-5s  peak %s KiB' % (
+                    scenario.name,
+                    result['latency_ms']['p50'], result['latency_ms']['p95'], result['latency_ms']['p99'],
+                    result['queries']['max'] if result['queries'] else '-',
+                    result['peak_memory_kb'] if result['peak_memory_kb'] is not None else '-',
+                )
+            )
+        return results
+
+    def compare(self, path, report):
+        with open(path) as fh:
+            previous = json.load(fh)
+        self.stdout.write('Compared with %s (commit %s):' % (path, previous.get('commit') or 'unknown'))
+        for name, result in report['results'].items():
+            before = previous['results'].get(name)
+            if before is None:
+                continue
+            old_p50, new_p50 = before['latency_ms']['p50'], result['latency_ms']['p50']
+            change = (new_p50 - old_p50) / old_p50 * 100 if old_p50 else 0.0
+            queries = ''
+            if before['queries'] and result['queries'] and before['queries']['max'] != result['queries']['max']:
+                queries = '  queries %d -> %d' % (before['queries']['max'], result['queries']['max'])
+            self.stdout.write('%-24s p50 %8.2fms -> %8.2fms (%+.1f%%)%s' % (name, old_p50, new_p50, change, queries))
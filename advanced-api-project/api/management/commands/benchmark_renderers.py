@@ -0,0 +1,62 @@
+import gzip
+import json
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from api.benchmarking import best_of, seed_books
+from api.models import Author, Book
+from api.renderers import ColumnarJSONRenderer, MessagePackRenderer, msgpack
+from api.serializers import AuthorSerializer, BookSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare JSONRenderer with the columnar JSON and MessagePack '
+        'renderers on Book and Author list payloads: bytes on the wire '
+        '(raw and gzipped), encode time and client-side decode time. Rows are '
+        'seeded inside a transaction that is rolled back afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows', type=int, nargs='+', default=[100, 10000],
+            help='Book counts to benchmark (default: 100 10000).',
+        )
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement; the fastest is kept.')
+
+    def handle(self, *args, **options):
+        renderers = [
+            ('json', JSONRenderer(), json.loads),
+            ('columnar', ColumnarJSONRenderer(), json.loads),
+        ]
+        if msgpack is not None:
+            renderers.append(('msgpack', MessagePackRenderer(), msgpack.unpackb))
+        else:
+            self.stdout.write(self.style.WARNING('msgpack is not installed; skipping MessagePackRenderer.'))
+
+        for rows in sorted(options['rows']):
+            with transaction.atomic():
+                seed_books(rows, authors=max(1, rows // 10))
+                payloads = {
+                    'books': {'results': BookSerializer(Book.objects.order_by('id'), many=True).data},
+                    'authors': AuthorSerializer(Author.objects.prefetch_related('books'), many=True).data,
+                }
+                transaction.set_rollback(True)
+
+            for name, data in payloads.items():
+                self.stdout.write('%s, %d books:' % (name, rows))
+                baseline = None
+                for label, renderer, decode in renderers:
+                    encode_time, body = best_of(lambda: renderer.render(data), options['repeat'])
+                    decode_time, _ = best_of(lambda: decode(body), options['repeat'])
+                    compressed = len(gzip.compress(body))
+                    if baseline is None:
+                        baseline = len(body)
+                    self.stdout.write(
+                        '  %-9s %10d bytes (%5.1f%%)  gzip %9d bytes  encode %8.2fms  decode %8.2fms' % (
+                            label, len(body), len(body) / baseline * 100, compressed,
+                            encode_time * 1000, decode_time * 1000,
+                        )
+                    )
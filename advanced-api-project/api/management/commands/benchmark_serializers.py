@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from api.benchmarking import best_of, seed_books
+from api.models import Book
+from api.serializers import BookSerializer, FastReadSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare Book list serialization throughput of BookSerializer and '
+        'the FastReadSerializer read path. Rows are seeded inside a '
+        'transaction that is rolled back afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows', type=int, nargs='+', default=[10000, 100000],
+            help='Row counts to benchmark (default: 10000 100000).',
+        )
+        parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement; the fastest is kept.')
+
+    def handle(self, *args, **options):
+        renderer = JSONRenderer()
+        fast = FastReadSerializer.from_serializer(BookSerializer())
+        queryset = Book.objects.order_by('id')
+
+        def regular():
+            return renderer.render(BookSerializer(queryset.all(), many=True).data)
+
+        def fast_path():
+            return renderer.render(fast.many(fast.values(queryset.all())))
+
+        for rows in sorted(options['rows']):
+            with transaction.atomic():
+                seed_books(rows)
+                regular_time, regular_output = best_of(regular, options['repeat'])
+                fast_time, fast_output = best_of(fast_path, options['repeat'])
+                transaction.set_rollback(True)
+
+            if regular_output != fast_output:
+                self.stdout.write(self.style.ERROR('%d rows: outputs differ!' % rows))
+            self.stdout.write(
+                '%7d rows  BookSerializer %8.3fs (%9.0f rows/s)  fast path %8.3fs (%9.0f rows/s)  %.1fx'
+                % (rows, regular_time, rows / regular_time, fast_time, rows / fast_time, regular_time / fast_time)
+            )
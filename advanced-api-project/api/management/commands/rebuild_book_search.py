@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from api import search
+from api.cache import invalidate_book_lists
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the FTS5 full-text index behind the Book API search.'
+
+    def handle(self, *args, **options):
+        if not search.search_available():
+            self.stdout.write('Full-text search needs SQLite with FTS5; nothing to rebuild.')
+            return
+        count = search.rebuild_index()
+        invalidate_book_lists()
+        self.stdout.write(self.style.SUCCESS('Indexed %d books.' % count))
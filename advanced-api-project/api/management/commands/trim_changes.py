@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from api.changes import trim_changes
+
+
+class Command(BaseCommand):
+    help = (
+        'Drop change feed tombstones older than CHANGE_FEED_RETENTION_DAYS. '
+        'The feed also trims on every read; run this from cron when it is rarely read.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help='Override CHANGE_FEED_RETENTION_DAYS.')
+
+    def handle(self, *args, **options):
+        horizon = trim_changes(options['days'])
+        self.stdout.write(self.style.SUCCESS('Change feed trimmed up to cursor %d.' % horizon))
@@ -0,0 +1,32 @@
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS api_book_search "
+        "USING fts5(title, author_name, tokenize='unicode61')"
+    )
+    schema_editor.execute(
+        "INSERT INTO api_book_search (rowid, title, author_name) "
+        "SELECT book.id, book.title, author.name FROM api_book book "
+        "JOIN api_author author ON author.id = book.author_id"
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS api_book_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
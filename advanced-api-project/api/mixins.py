@@ -0,0 +1,344 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connection
+from django.db.models import Prefetch, prefetch_related_objects
+from django.http import StreamingHttpResponse
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.relations import ManyRelatedField, RelatedField
+from rest_framework.response import Response
+
+from .cache import make_list_key, single_flight
+from .renderers import API_RENDERER_CLASSES, CSVRenderer, NDJSONRenderer, StreamingRenderer
+from .serializers import FastReadSerializer, is_read_request, parse_pk
+
+
+def plan_queryset(serializer, model, prefix='', required=()):
+    """
+    Work out the eager loading a serializer needs for ``model``.
+
+    Returns ``(select_related, prefetches, only)`` where the lookups are
+    prefixed with ``prefix``. ``only`` is None when some field reads an
+    attribute we cannot map to a column (a property, a method or a
+    ``source='*'`` field), in which case no columns are deferred.
+    """
+    select_related = []
+    prefetches = []
+    only = {prefix + model._meta.pk.name}
+    only.update(prefix + name for name in required)
+    restrict = True
+
+    # Fields may plan their own prefetch (see CappedListSerializer); lists
+    # go first so a count sharing their relation reuses their rows.
+    fields = sorted(
+        serializer.fields.values(),
+        key=lambda field: not isinstance(field, serializers.ListSerializer),
+    )
+    planned = set()
+    for field in fields:
+        if field.write_only:
+            continue
+        if field.source == '*' or '.' in field.source:
+            restrict = False
+            continue
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            restrict = False
+            continue
+
+        lookup = prefix + field.source
+        if hasattr(field, 'get_prefetch'):
+            if lookup not in planned:
+                planned.add(lookup)
+                prefetches.append(field.get_prefetch(lookup, _related_queryset(field, model_field), model_field))
+        elif isinstance(field, serializers.ListSerializer) or isinstance(field, ManyRelatedField):
+            prefetches.append(Prefetch(lookup, queryset=_related_queryset(field, model_field)))
+        elif isinstance(field, serializers.ModelSerializer):
+            select_related.append(lookup)
+            only.add(lookup)
+            nested = plan_queryset(field, model_field.related_model, prefix=lookup + '__')
+            select_related.extend(nested[0])
+            prefetches.extend(nested[1])
+            if nested[2] is None:
+                restrict = False
+            else:
+                only.update(nested[2])
+        elif isinstance(field, RelatedField):
+            only.add(lookup)
+            if not field.use_pk_only_optimization():
+                select_related.append(lookup)
+                restrict = False
+        elif model_field.concrete:
+            only.add(lookup)
+        else:
+            restrict = False
+
+    return select_related, prefetches, only if restrict else None
+
+
+def _related_queryset(field, model_field):
+    """
+    Build the queryset for prefetching a to-many relation, itself
+    optimized for the nested serializer when there is one.
+    """
+    related_model = model_field.related_model
+    queryset = related_model._default_manager.all()
+    # The reverse side of a foreign key needs the join column to attach rows.
+    required = (model_field.field.name,) if model_field.one_to_many else ()
+    child = getattr(field, 'child', None)
+    if isinstance(child, serializers.ModelSerializer):
+        return optimize_queryset(queryset, child, required=required)
+    return queryset.only(related_model._meta.pk.name, *required)
+
+
+def optimize_queryset(queryset, serializer, required=()):
+    """
+    Apply select_related/prefetch_related/only() to ``queryset`` based on
+    the shape of ``serializer``.
+    """
+    select_related, prefetches, only = plan_queryset(serializer, queryset.model, required=required)
+    if select_related:
+        queryset = queryset.select_related(*select_related)
+    if prefetches:
+        queryset = queryset.prefetch_related(*prefetches)
+    if only is not None:
+        queryset = queryset.only(*only)
+    return queryset
+
+
+class QuerySetOptimizerMixin:
+    """
+    Generic view mixin that eager-loads whatever the view's serializer is
+    going to read, so list endpoints run a fixed number of queries however
+    many rows they return.
+
+    ``optimizer_required_fields`` lists extra columns the view itself reads
+    (beyond the serializer) so they are not deferred. Writes get the plain
+    queryset: saving a partially loaded row would skip the deferred columns
+    (including auto_now stamps).
+    """
+    optimizer_required_fields = ()
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if not is_read_request(self.request):
+            return queryset
+        return optimize_queryset(queryset, self.get_serializer(), required=self.get_optimizer_required_fields())
+
+    def get_optimizer_required_fields(self):
+        return self.optimizer_required_fields
+
+
+class FastListMixin:
+    """
+    List view mixin that serves GETs through FastReadSerializer whenever
+    the view's (shaped) serializer allows it, reading ``.values()`` rows
+    instead of model instances. Output is identical to the regular path.
+    """
+    fast_serializer_class = FastReadSerializer
+
+    def get_fast_serializer(self):
+        if not is_read_request(self.request):
+            return None
+        return self.fast_serializer_class.from_serializer(self.get_serializer())
+
+    def list(self, request, *args, **kwargs):
+        fast = self.get_fast_serializer()
+        if fast is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = fast.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(fast.many(page))
+        return Response(fast.many(queryset))
+
+
+class MultiGetMixin:
+    """
+    View mixin fetching many objects by id in one ``IN`` query, instead of
+    one detail request per object.
+
+    On a list view, ``?ids=3,1,2`` replaces the list; ``lookup()`` serves
+    the same from a POSTed ``{"ids": [...]}`` for lists too long for a URL.
+    The response holds the objects in request order (duplicates collapsed)
+    and the ids that were not found: ``{"results": [...], "missing": [...]}``.
+    ?fields= and ?expand= apply as usual; list filters and pagination do not.
+    """
+    ids_query_param = 'ids'
+    max_ids = 1000
+
+    def list(self, request, *args, **kwargs):
+        if self.ids_query_param not in request.query_params:
+            return super().list(request, *args, **kwargs)
+        return self.multi_get(self.parse_ids(request.query_params[self.ids_query_param].split(',')))
+
+    def lookup(self, request, *args, **kwargs):
+        # A read sent as POST: shape and optimize it like a GET.
+        request.multi_get = True
+        ids = request.data.get('ids') if isinstance(request.data, dict) else None
+        return self.multi_get(self.parse_ids(ids))
+
+    def parse_ids(self, values):
+        if not isinstance(values, list):
+            raise ValidationError({'ids': ['Expected a list of ids.']})
+        ids = []
+        model = self.get_queryset().model
+        for value in values:
+            pk = parse_pk(value, model)
+            if pk is None:
+                raise ValidationError({'ids': ['Invalid id: %r.' % (value,)]})
+            ids.append(pk)
+        ids = list(dict.fromkeys(ids))
+        if len(ids) > self.max_ids:
+            raise ValidationError({'ids': ['At most %d ids per request.' % self.max_ids]})
+        return ids
+
+    def multi_get(self, ids):
+        queryset = self.get_queryset().filter(pk__in=ids)
+        pk_name = queryset.model._meta.pk.attname
+        fast = self.get_fast_serializer() if hasattr(self, 'get_fast_serializer') else None
+        if fast is not None:
+            rows = {row[pk_name]: row for row in queryset.values(*dict.fromkeys([pk_name, *fast.lookups]))}
+            results = [fast.to_representation(rows[pk]) for pk in ids if pk in rows]
+        else:
+            rows = {instance.pk: instance for instance in queryset}
+            results = self.get_serializer([rows[pk] for pk in ids if pk in rows], many=True).data
+        return Response({'results': results, 'missing': [pk for pk in ids if pk not in rows]})
+
+
+class StreamingExportMixin:
+    """
+    List view mixin adding an opt-in export mode (``?format=ndjson`` or
+    ``?format=csv``, or the matching Accept header).
+
+    The filtered queryset is read with ``.iterator(chunk_size=...)`` and
+    each row is serialized and written as it is fetched, so memory stays
+    flat and the first byte goes out right away. Exports are not paginated.
+    """
+    renderer_classes = [*API_RENDERER_CLASSES, NDJSONRenderer, CSVRenderer]
+    export_chunk_size = 2000
+
+    def list(self, request, *args, **kwargs):
+        renderer = request.accepted_renderer
+        if not isinstance(renderer, StreamingRenderer):
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer = self.get_serializer()
+        fields = [name for name, field in serializer.fields.items() if not field.write_only]
+        fast = self.get_fast_serializer() if hasattr(self, 'get_fast_serializer') else None
+        if fast is not None:
+            rows = (
+                fast.to_representation(row)
+                for row in fast.values(queryset).iterator(chunk_size=self.export_chunk_size)
+            )
+        else:
+            rows = (
+                serializer.to_representation(instance)
+                for instance in queryset.iterator(chunk_size=self.export_chunk_size)
+            )
+        response = StreamingHttpResponse(
+            renderer.stream(rows, fields),
+            content_type='%s; charset=%s' % (renderer.media_type, renderer.charset),
+        )
+        filename = '%s.%s' % (queryset.model._meta.model_name, renderer.format)
+        response['Content-Disposition'] = 'attachment; filename="%s"' % filename
+        return response
+
+
+class ConditionalRetrieveMixin:
+    """
+    Retrieve view mixin answering conditional GETs from the object's
+    ``updated_at`` stamp, and those of any relations expanded into the body
+    (``?expand=``), since those change the response too.
+
+    Responses carry ``ETag`` and ``Last-Modified``. When the client's copy is
+    current (``If-None-Match``/``If-Modified-Since``) a 304 is returned
+    straight after the single-row lookup: prefetches are postponed until we
+    know the body is needed and the serializer never runs.
+    """
+    stamp_field = 'updated_at'
+    optimizer_required_fields = (stamp_field,)
+
+    def retrieve(self, request, *args, **kwargs):
+        self.postpone_prefetch = True
+        instance = self.get_object()
+        etag, last_modified = self.get_validators(instance)
+        headers = {'ETag': etag, 'Last-Modified': http_date(last_modified)}
+
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            for header, value in headers.items():
+                not_modified[header] = value
+            return not_modified
+
+        prefetch_related_objects([instance], *self.postponed_prefetches)
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data, headers=headers)
+
+    def get_expanded_relations(self):
+        """
+        Return the relations embedded as nested serializers whose model
+        carries a stamp, e.g. the author under ?expand=author.
+        """
+        return [
+            field.source for field in self.get_serializer().fields.values()
+            if isinstance(field, serializers.ModelSerializer) and not field.write_only
+            and any(model_field.name == self.stamp_field for model_field in field.Meta.model._meta.concrete_fields)
+        ]
+
+    def get_optimizer_required_fields(self):
+        # The expanded relations are joined; load their stamps with them.
+        return (
+            *super().get_optimizer_required_fields(),
+            *('%s__%s' % (relation, self.stamp_field) for relation in self.get_expanded_relations()),
+        )
+
+    def get_validators(self, instance):
+        """
+        Return the (ETag, Last-Modified timestamp) pair for ``instance``.
+        """
+        stamps = [getattr(instance, self.stamp_field)]
+        for relation in self.get_expanded_relations():
+            related = getattr(instance, relation)
+            if related is not None:
+                stamps.append(getattr(related, self.stamp_field))
+        etag = quote_etag('%s-%s' % (
+            instance.pk, '-'.join('%d.%06d' % (stamp.timestamp(), stamp.microsecond) for stamp in stamps),
+        ))
+        return etag, int(max(stamps).timestamp())
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if getattr(self, 'postpone_prefetch', False):
+            self.postponed_prefetches = queryset._prefetch_related_lookups
+            queryset = queryset.prefetch_related(None)
+        return queryset
+
+
+class CachedListMixin:
+    """
+    List view mixin caching response data per normalized query string and
+    auth state (see api.cache).
+
+    Entries are keyed on a generation counter that Book/Author writes bump,
+    so writes invalidate everything at once. Concurrent misses on the same
+    key are collapsed into one database query. Requests running inside a
+    transaction bypass the cache, since what they see may still roll back.
+    """
+    list_cache_timeout = 300
+
+    def list(self, request, *args, **kwargs):
+        if connection.in_atomic_block:
+            return super().list(request, *args, **kwargs)
+
+        parent_list = super().list
+
+        def compute():
+            return parent_list(request, *args, **kwargs).data
+
+        data = single_flight(make_list_key(request), compute, self.list_cache_timeout)
+        return Response(data)
@@ -1,21 +1,154 @@
 from django.db import models
+from django.utils import timezone
 
-class Author(models.Model):
+class AuthorQuerySet(models.QuerySet):
+    def touch(self):
+        """
+        Bump updated_at without loading the rows, e.g. when one of the
+        authors' books changed.
+        """
+        return self.update(updated_at=timezone.now())
+
+class TrackedFieldsModel(models.Model):
+    """
+    Abstract model remembering the column values it was loaded with.
+
+    save() on a loaded instance writes only the columns that changed since
+    (plus auto_now stamps) and skips the write, and its signals, when
+    nothing did. Receivers can use ``update_fields`` and ``loaded_values``
+    to see what changed. Explicit ``update_fields`` are left alone.
+    """
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = instance._current_values()
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, *args, **kwargs):
+        super().refresh_from_db(using, fields, *args, **kwargs)
+        # The refreshed columns now hold what the database holds.
+        current = self._current_values()
+        if fields is not None:
+            fields = set(fields)
+            current = {
+                field.attname: current[field.attname] for field in self._meta.concrete_fields
+                if field.attname in current and (field.name in fields or field.attname in fields)
+            }
+        self._loaded_values = {**self.loaded_values, **current}
+
+    @property
+    def loaded_values(self):
+        return getattr(self, '_loaded_values', {})
+
+    def _current_values(self):
+        # Deferred columns are absent from __dict__ until they are read.
+        return {
+            field.attname: self.__dict__[field.attname]
+            for field in self._meta.concrete_fields if field.attname in self.__dict__
+        }
+
+    def get_dirty_fields(self):
+        """
+        Return the names of the loaded (or since assigned) columns whose
+        value differs from the one loaded.
+        """
+        loaded = self.loaded_values
+        return [
+            field.name for field in self._meta.concrete_fields
+            if not field.primary_key and field.attname in self.__dict__
+            and (field.attname not in loaded or self.__dict__[field.attname] != loaded[field.attname])
+        ]
+
+    def save(self, *args, **kwargs):
+        tracked = (
+            hasattr(self, '_loaded_values') and not self._state.adding
+            and kwargs.get('update_fields') is None and not kwargs.get('force_insert')
+        )
+        if tracked:
+            dirty = self.get_dirty_fields()
+            if not dirty:
+                return
+            stamps = [
+                field.name for field in self._meta.concrete_fields
+                if getattr(field, 'auto_now', False) and field.name not in dirty
+            ]
+            kwargs['update_fields'] = dirty + stamps
+        super().save(*args, **kwargs)
+        self._loaded_values = self._current_values()
+
+class Author(TrackedFieldsModel):
     """
     Represents an author of a book.
+    updated_at also moves whenever one of the author's books changes,
+    since the author representation embeds them.
     """
     name = models.CharField(max_length=100)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = AuthorQuerySet.as_manager()
 
     def __str__(self):
         return self.name
 
-class Book(models.Model):
+class Book(TrackedFieldsModel):
     """
     Represents a book with a title, publication year, and an author.
     """
     title = models.CharField(max_length=100)
     publication_year = models.IntegerField()
     author = models.ForeignKey(Author, on_delete=models.CASCADE, related_name='books')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        # Access paths of BookListView: every filterable field, alone or
+        # combined with the author filter, followed by the id tiebreaker the
+        # keyset pagination orders on.
+        indexes = [
+            models.Index(fields=['title', 'id'], name='book_title_id_idx'),
+            models.Index(fields=['publication_year', 'id'], name='book_year_id_idx'),
+            models.Index(fields=['author', 'title', 'id'], name='book_author_title_idx'),
+            models.Index(fields=['author', 'publication_year', 'id'], name='book_author_year_idx'),
+        ]
 
     def __str__(self):
         return self.title
+
+class Change(models.Model):
+    """
+    One entry of the Book/Author change feed (see api.changes).
+
+    The log is compacted per object: recording a change deletes the
+    object's earlier entries, so it holds at most one entry per object, and
+    the auto-incrementing id doubles as the feed cursor. Deletions
+    (tombstones) are trimmed once they are older than the retention period.
+    """
+    CREATED = 'created'
+    UPDATED = 'updated'
+    DELETED = 'deleted'
+    ACTION_CHOICES = [(CREATED, 'Created'), (UPDATED, 'Updated'), (DELETED, 'Deleted')]
+
+    resource = models.CharField(max_length=16)
+    object_id = models.BigIntegerField()
+    action = models.CharField(max_length=8, choices=ACTION_CHOICES)
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            # Compaction looks up an object's earlier entries.
+            models.Index(fields=['resource', 'object_id'], name='change_object_idx'),
+            # Trimming finds expired tombstones.
+            models.Index(fields=['action', 'changed_at'], name='change_action_time_idx'),
+        ]
+
+    def __str__(self):
+        return '%s %s %s' % (self.action, self.resource, self.object_id)
+
+class ChangeHorizon(models.Model):
+    """
+    Single row holding the id of the newest trimmed tombstone. A cursor
+    older than this may have missed deletions and must resync.
+    """
+    last_trimmed_id = models.BigIntegerField(default=0)
@@ -0,0 +1,341 @@
+import json
+from base64 import b64decode, b64encode
+from urllib import parse
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, connection
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Keyset (seek) pagination over the view's ordering.
+
+    DRF's CursorPagination only keys on the first ordering field and falls
+    back to an OFFSET for ties. Here the cursor stores the full position of
+    the boundary row (every ordering field plus the primary key tiebreaker),
+    so each page is a single indexed range query and deep pages cost the
+    same as the first one.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('id',)
+    tiebreaker = 'id'
+    # Set count_cap to report a total on the first page (see get_count()).
+    count_cap = None
+    count_query_param = 'count'
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Use the ordering already applied to the queryset by the filter
+        backends (OrderingFilter, search relevance), falling back to the
+        OrderingFilter/default ordering, and append the tiebreaker in the
+        same direction as the leading field.
+        """
+        applied = queryset.query.order_by
+        if applied and all(isinstance(field, str) and '__' not in field for field in applied):
+            ordering = list(applied)
+        else:
+            ordering = list(super().get_ordering(request, queryset, view))
+        names = [field.lstrip('-') for field in ordering]
+        if self.tiebreaker not in names:
+            descending = ordering[0].startswith('-')
+            ordering.append(('-' if descending else '') + self.tiebreaker)
+        return tuple(ordering)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_queryset = self.get_page_queryset(queryset, request, view)
+        if page_queryset is None:
+            return None
+        if self.count_queryset is not None:
+            self.count, self.count_exact = self.get_count(self.count_queryset)
+        return self.build_page(list(page_queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Async counterpart of paginate_queryset() for the async views.
+        """
+        page_queryset = self.get_page_queryset(queryset, request, view)
+        if page_queryset is None:
+            return None
+        if self.count_queryset is not None:
+            self.count, self.count_exact = await self.aget_count(self.count_queryset)
+        return self.build_page([row async for row in page_queryset])
+
+    def wants_count(self, request):
+        """
+        Totals are reported on the first page only, where clients read
+        them, unless ``?count=exact`` asks for one on any page.
+        """
+        if self.count_cap is None:
+            return False
+        return self.cursor is None or self.exact_count_requested(request)
+
+    def exact_count_requested(self, request):
+        return request.query_params.get(self.count_query_param) == 'exact'
+
+    def get_count(self, queryset):
+        """
+        Return ``(count, exact)`` for the filtered queryset.
+
+        By default counting stops after ``count_cap`` rows, so the cost is
+        bounded however many rows match. Past the cap an unfiltered query
+        reports the table statistics estimate when the database keeps one;
+        otherwise ``count_cap`` with ``exact`` False (i.e. "count_cap+").
+        ``?count=exact`` runs a full COUNT(*).
+        """
+        queryset = self.get_count_queryset(queryset)
+        if self.exact_count_requested(self.request):
+            return queryset.count(), True
+        count = queryset[:self.count_cap + 1].count()
+        if count <= self.count_cap:
+            return count, True
+        return self.get_estimate(queryset), False
+
+    async def aget_count(self, queryset):
+        queryset = self.get_count_queryset(queryset)
+        if self.exact_count_requested(self.request):
+            return await queryset.acount(), True
+        count = await queryset[:self.count_cap + 1].acount()
+        if count <= self.count_cap:
+            return count, True
+        return await sync_to_async(self.get_estimate)(queryset), False
+
+    def get_count_queryset(self, queryset):
+        # Drop ordering and selected annotations (e.g. a search rank);
+        # only the matching primary keys matter for counting.
+        return queryset.order_by().values('pk')
+
+    def get_estimate(self, queryset):
+        if not queryset.query.where:
+            estimate = estimate_row_count(queryset.model)
+            if estimate is not None and estimate > self.count_cap:
+                return estimate
+        return self.count_cap
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if self.count_cap is not None:
+            response.data = {
+                'count': self.count,
+                'count_exact': self.count_exact,
+                **response.data,
+            }
+        return response
+
+    def get_paginated_response_schema(self, schema):
+        schema = super().get_paginated_response_schema(schema)
+        if self.count_cap is not None:
+            schema['properties'] = {
+                'count': {'type': 'integer', 'nullable': True, 'example': 123},
+                'count_exact': {'type': 'boolean', 'nullable': True},
+                **schema['properties'],
+            }
+        return schema
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """
+        Return the (unevaluated) queryset for the requested page, fetching
+        one row past the page size so we know whether another page exists.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is not None:
+            self.cursor['p'] = self.clean_position(queryset, self.cursor['p'])
+        self.count = self.count_exact = None
+        self.count_queryset = queryset if self.wants_count(request) else None
+
+        # The boundary rows' ordering values go into the cursor, so they
+        # must be loaded even when a sparse fieldset or a values() query
+        # leaves them out.
+        names = [field.lstrip('-') for field in self.ordering]
+        if queryset._fields is not None:
+            missing = [name for name in names if name not in queryset._fields]
+            if missing:
+                queryset = queryset.values(*queryset._fields, *missing)
+        else:
+            loaded, deferring = queryset.query.deferred_loading
+            if loaded and not deferring:
+                columns = set(names) - set(queryset.query.annotations)
+                queryset = queryset.only(*loaded, *columns)
+
+        reverse = self.cursor is not None and self.cursor['r']
+        ordering = self.ordering
+        if reverse:
+            ordering = tuple(_invert(field) for field in ordering)
+        queryset = queryset.order_by(*ordering)
+
+        if self.cursor is not None:
+            queryset = queryset.filter(self.keyset_filter(ordering, self.cursor['p']))
+
+        return queryset[:self.page_size + 1]
+
+    def build_page(self, results):
+        """
+        Trim the look-ahead row and work out the next/previous state.
+        """
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+
+        if self.cursor is not None and self.cursor['r']:
+            self.page.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+
+        return self.page
+
+    def clean_position(self, queryset, position):
+        """
+        Convert a decoded cursor position with each ordering field's
+        ``to_python()``, so a tampered cursor or one issued for another
+        ordering is rejected as invalid instead of failing in the query.
+        """
+        cleaned = []
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip('-')
+            if name in queryset.query.annotations:
+                model_field = queryset.query.annotations[name].output_field
+            else:
+                model_field = queryset.model._meta.get_field(name)
+            try:
+                if value is None:
+                    raise ValueError(name)
+                value = model_field.to_python(value)
+                model_field.run_validators(value)
+            except (ValidationError, TypeError, ValueError):
+                raise NotFound(self.invalid_cursor_message)
+            cleaned.append(value)
+        return cleaned
+
+    def keyset_filter(self, ordering, position):
+        """
+        Build the row-value comparison ``(f1, f2, ...) > (v1, v2, ...)``
+        expanded into ORs so that mixed directions are supported.
+
+        The OR form alone cannot be used as an index range, so it is ANDed
+        with the non-strict bound on the leading field (``f1 >= v1``), which
+        lets the database seek straight to the cursor position.
+        """
+        condition = Q()
+        equal = Q()
+        for field, value in zip(ordering, position):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= equal & Q(**{'%s__%s' % (name, lookup): value})
+            equal &= Q(**{name: value})
+        leading = ordering[0]
+        bound = Q(**{'%s__%s' % (leading.lstrip('-'), 'lte' if leading.startswith('-') else 'gte'): position[0]})
+        return bound & condition
+
+    def get_position(self, row):
+        names = [field.lstrip('-') for field in self.ordering]
+        if isinstance(row, dict):
+            return [row[name] for name in names]
+        return [getattr(row, name) for name in names]
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            # An empty page reached by moving backward: restart from the top.
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor({'p': self.get_position(self.page[-1]), 'r': False})
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            # An empty page reached by moving forward: step back from the cursor.
+            return self.encode_cursor({'p': self.cursor['p'], 'r': True})
+        return self.encode_cursor({'p': self.get_position(self.page[0]), 'r': True})
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            querystring = b64decode(encoded.encode('ascii')).decode('ascii')
+            tokens = parse.parse_qs(querystring, keep_blank_values=True)
+            position = json.loads(tokens['p'][0])
+            reverse = bool(int(tokens.get('r', ['0'])[0]))
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return {'p': position, 'r': reverse}
+
+    def encode_cursor(self, cursor):
+        tokens = {'p': json.dumps(cursor['p'], separators=(',', ':'))}
+        if cursor['r']:
+            tokens['r'] = '1'
+        querystring = parse.urlencode(tokens, doseq=True)
+        encoded = b64encode(querystring.encode('ascii')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_html_context(self):
+        return {
+            'previous_url': self.get_previous_link(),
+            'next_url': self.get_next_link(),
+        }
+
+
+class BookCursorPagination(KeysetCursorPagination):
+    """
+    Keyset pagination for the Book list, keyed on the view's
+    ``ordering_fields`` (``title``, ``publication_year``) with ``id`` as
+    the tiebreaker. The first page reports a total capped at 10,000.
+    """
+    ordering = ('id',)
+    count_cap = 10000
+
+
+def estimate_row_count(model):
+    """
+    The database's own row-count estimate for ``model``'s table, from the
+    statistics it keeps for the planner; None when there are none (e.g.
+    SQLite before ANALYZE has run).
+    """
+    table = model._meta.db_table
+    queries = {
+        'postgresql': ('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass', [table]),
+        'mysql': (
+            'SELECT table_rows FROM information_schema.tables '
+            'WHERE table_schema = DATABASE() AND table_name = %s', [table],
+        ),
+        # The first number of each index's stat is the rows in that index.
+        'sqlite': (
+            "SELECT MAX(CAST(substr(stat, 1, instr(stat || ' ', ' ') - 1) AS INTEGER)) "
+            "FROM sqlite_stat1 WHERE tbl = %s", [table],
+        ),
+    }
+    if connection.vendor not in queries:
+        return None
+    sql, params = queries[connection.vendor]
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            row = cursor.fetchone()
+    except DatabaseError:
+        # No statistics table yet.
+        return None
+    if row is None or row[0] is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+def _invert(field):
+    return field[1:] if field.startswith('-') else '-' + field
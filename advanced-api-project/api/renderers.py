@@ -0,0 +1,130 @@
+import csv
+import json
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class StreamingRenderer(BaseRenderer):
+    """
+    Base class for renderers that can write rows one at a time.
+
+    Views hand ``stream()`` an iterable of serialized rows and wrap the
+    result in a StreamingHttpResponse, so nothing is buffered beyond the
+    current row. ``render()`` is kept for ordinary (non-streamed) responses
+    such as errors.
+    """
+    charset = 'utf-8'
+
+    def stream(self, rows, fields):
+        raise NotImplementedError('StreamingRenderer.stream() must be implemented.')
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        rows = data if isinstance(data, list) else [data]
+        fields = list(rows[0].keys()) if rows else []
+        return b''.join(self.stream(rows, fields))
+
+
+class NDJSONRenderer(StreamingRenderer):
+    """
+    Newline-delimited JSON: one object per line.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+    def stream(self, rows, fields):
+        for row in rows:
+            yield (json.dumps(row, cls=JSONEncoder, ensure_ascii=False) + '\n').encode(self.charset)
+
+
+class _LineBuffer:
+    """
+    File-like object that hands back whatever csv.writer writes to it.
+    """
+    def write(self, value):
+        return value
+
+
+class CSVRenderer(StreamingRenderer):
+    """
+    CSV with a header row. Nested values (lists, dicts) are written as JSON.
+    """
+    media_type = 'text/csv'
+    format = 'csv'
+
+    def stream(self, rows, fields):
+        writer = csv.writer(_LineBuffer())
+        yield writer.writerow(fields).encode(self.charset)
+        for row in rows:
+            values = [self.format_value(row.get(field)) for field in fields]
+            yield writer.writerow(values).encode(self.charset)
+
+    def format_value(self, value):
+        if isinstance(value, (list, dict)):
+            return json.dumps(value, cls=JSONEncoder, ensure_ascii=False)
+        if value is None:
+            return ''
+        return value
+
+
+def to_columns(data):
+    """
+    Turn a list of rows (or the ``results`` of a paginated response) into
+    one array per field, keyed by field name in serializer order. Anything
+    else (single objects, errors) is returned unchanged.
+    """
+    if isinstance(data, dict) and isinstance(data.get('results'), list):
+        return {**data, 'results': to_columns(data['results'])}
+    if not isinstance(data, list) or not all(isinstance(row, dict) for row in data):
+        return data
+    fields = list(data[0]) if data else []
+    return {field: [row.get(field) for row in data] for field in fields}
+
+
+class ColumnarJSONRenderer(JSONRenderer):
+    """
+    JSON with list data laid out by column: ``{"id": [1, 2], "title": [...]}``
+    instead of one object per row, so keys are not repeated for every row.
+    """
+    media_type = 'application/vnd.columnar+json'
+    format = 'columnar'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return super().render(to_columns(data), accepted_media_type, renderer_context)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    MessagePack encoding of the same data JSONRenderer would send. Needs the
+    optional ``msgpack`` package; without it the renderer is not offered.
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=_msgpack_default, use_bin_type=True)
+
+
+def _msgpack_default(obj):
+    # Dates, decimals, UUIDs, lazy strings...: the same conversions as JSON.
+    return JSONEncoder().default(obj)
+
+
+# Renderers offered by the Book/Author API views, negotiated via Accept or ?format=.
+API_RENDERER_CLASSES = [
+    *api_settings.DEFAULT_RENDERER_CLASSES,
+    ColumnarJSONRenderer,
+    *([MessagePackRenderer] if msgpack is not None else []),
+]
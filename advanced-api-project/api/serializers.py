@@ -1,28 +1,346 @@
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError
+from django.db.models import Count, F, Prefetch, Window, prefetch_related_objects
+from django.urls import reverse
 from rest_framework import serializers
-from .models import Author, Book
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+from .models import Author, Book, Change
 import datetime
+import re
 
-class BookSerializer(serializers.ModelSerializer):
+def is_read_request(request):
+    """
+    True for requests that only read: safe methods, and POSTed multi-get
+    lookups (flagged by MultiGetMixin).
+    """
+    return request.method in SAFE_METHODS or getattr(request, 'multi_get', False)
+
+def parse_pk(value, model):
+    """
+    Return ``value`` as a primary key of ``model``, or None unless it is an
+    int or a string of ASCII digits within the pk column's range. Unlike
+    int(), floats and Unicode digits are refused rather than truncated or
+    passed on to a query the database cannot run.
+    """
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        return None
+    value = str(value).strip()
+    if not re.fullmatch('[0-9]+', value):
+        return None
+    try:
+        model._meta.pk.run_validators(int(value))
+    except DjangoValidationError:
+        return None
+    return int(value)
+
+def parse_field_list(value):
+    """
+    Split a comma-separated query parameter into a list of field paths.
+    """
+    return [part.strip() for part in (value or '').split(',') if part.strip()]
+
+def group_field_paths(paths):
+    """
+    Group dotted paths by their first segment: ['a', 'b.c'] -> {'a': [], 'b': ['c']}.
+    """
+    groups = {}
+    for path in paths:
+        head, _, rest = path.partition('.')
+        groups.setdefault(head, [])
+        if rest:
+            groups[head].append(rest)
+    return groups
+
+def nested_serializer(field):
+    field = getattr(field, 'child', field)
+    return field if isinstance(field, serializers.Serializer) else None
+
+def expand_fields(serializer, paths):
+    """
+    Replace the fields named in ``paths`` with the nested serializers
+    declared in ``Meta.expandable_fields``; dotted paths expand inside
+    nested serializers.
+    """
+    expandable = getattr(getattr(serializer, 'Meta', None), 'expandable_fields', {})
+    for name, rest in group_field_paths(paths).items():
+        if name in expandable:
+            serializer_class, kwargs = expandable[name]
+            serializer.fields[name] = serializer_class(read_only=True, **kwargs)
+        nested = nested_serializer(serializer.fields.get(name))
+        if rest and nested is not None:
+            expand_fields(nested, rest)
+
+def select_fields(serializer, paths):
+    """
+    Drop every field not named in ``paths``; dotted paths select fields of
+    nested serializers.
+    """
+    groups = group_field_paths(paths)
+    for name in list(serializer.fields):
+        if name not in groups:
+            serializer.fields.pop(name)
+    for name, rest in groups.items():
+        nested = nested_serializer(serializer.fields.get(name))
+        if rest and nested is not None:
+            select_fields(nested, rest)
+
+class DynamicFieldsMixin:
+    """
+    Serializer mixin for sparse fieldsets and explicit expansion on reads.
+
+    ``?fields=id,title`` keeps only the listed fields and ``?expand=author``
+    swaps a relation for the nested serializer in ``Meta.expandable_fields``
+    (both accept dotted paths for nested serializers). Only the serializer
+    the view builds sees the request at init time, so nested serializers
+    are shaped through their parent. QuerySetOptimizerMixin plans the query
+    from the shaped serializer, so dropped fields are never fetched.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self._context.get('request')
+        if request is None or not is_read_request(request):
+            return
+        expand = parse_field_list(request.query_params.get('expand'))
+        fields = parse_field_list(request.query_params.get('fields'))
+        if expand:
+            expand_fields(self, expand)
+        if fields:
+            select_fields(self, fields)
+
+class AuthorSummarySerializer(serializers.ModelSerializer):
+    """
+    Compact Author representation used when a book's author is expanded.
+    """
+    class Meta:
+        model = Author
+        fields = ['id', 'name']
+
+class BookSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for the Book model. Includes validation to ensure the
     publication year is not in the future.
+    The author can be expanded with ?expand=author.
     """
     class Meta:
         model = Book
-        fields = '__all__'
+        exclude = ['updated_at']
+        expandable_fields = {'author': (AuthorSummarySerializer, {})}
 
     def validate_publication_year(self, value):
         if value > datetime.date.today().year:
             raise serializers.ValidationError("Publication year cannot be in the future.")
         return value
 
-class AuthorSerializer(serializers.ModelSerializer):
+# The window annotation carrying each prefetched row's related-set total.
+CAPPED_TOTAL = 'capped_total'
+
+def capped_attr(source):
+    """
+    The attribute a capped prefetch of the ``source`` relation is stored in.
+    """
+    return 'capped_%s' % source
+
+def capped_prefetch(lookup, queryset, model_field, source, ordering, limit):
+    """
+    Prefetch the first ``limit`` related rows in ``ordering`` for every parent
+    in one query. Django turns the sliced queryset into a ROW_NUMBER()
+    window per parent; a COUNT() window over the same partition carries the
+    parent's full total on each row.
+    """
+    total = Window(Count('pk'), partition_by=[F(model_field.field.name)])
+    queryset = queryset.annotate(**{CAPPED_TOTAL: total}).order_by(*ordering)[:limit]
+    return Prefetch(lookup, queryset=queryset, to_attr=capped_attr(source))
+
+class CappedListSerializer(serializers.ListSerializer):
+    """
+    Nested to-many list holding only the first ``limit`` related rows in
+    ``ordering`` (``limit`` may be a callable, read on every use).
+    QuerySetOptimizerMixin loads them through
+    ``get_prefetch()``; otherwise they are fetched per parent on first use.
+    """
+    def __init__(self, *args, limit, ordering, **kwargs):
+        self.limit = limit
+        self.ordering = ordering
+        super().__init__(*args, **kwargs)
+
+    def get_limit(self):
+        return self.limit() if callable(self.limit) else self.limit
+
+    def get_prefetch(self, lookup, queryset, model_field):
+        return capped_prefetch(lookup, queryset, model_field, self.source, self.ordering, self.get_limit())
+
+    def to_representation(self, data):
+        instance = data.instance
+        attr = capped_attr(self.source)
+        if not hasattr(instance, attr):
+            # Not prefetched (e.g. a write response): load this one parent
+            # the same way, so a RelatedCountField reuses the rows.
+            model_field = instance._meta.get_field(self.source)
+            prefetch = self.get_prefetch(self.source, data.model._default_manager.all(), model_field)
+            prefetch_related_objects([instance], prefetch)
+        return [self.child.to_representation(item) for item in getattr(instance, attr)]
+
+class RelatedCountField(serializers.Field):
+    """
+    Size of a to-many relation. Read from the capped prefetch of the same
+    relation when there is one, so it costs no extra query; on its own it
+    prefetches a single row per parent just to carry the total.
+    """
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def get_prefetch(self, lookup, queryset, model_field):
+        return capped_prefetch(lookup, queryset, model_field, self.source, ('pk',), 1)
+
+    def to_representation(self, manager):
+        rows = getattr(manager.instance, capped_attr(self.source), None)
+        if rows is None:
+            return manager.count()
+        return getattr(rows[0], CAPPED_TOTAL) if rows else 0
+
+class FilteredListLinkField(serializers.Field):
     """
-    Serializer for the Author model. Includes a nested representation of the
-    author's books.
+    Link to a list view filtered on this object's id, e.g.
+    ``/api/books/?author=1``. Absolute when the request is in the context.
     """
-    books = BookSerializer(many=True, read_only=True)
+    def __init__(self, view_name, filter_param, **kwargs):
+        self.view_name = view_name
+        self.filter_param = filter_param
+        kwargs['read_only'] = True
+        kwargs.setdefault('source', 'id')
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        url = '%s?%s=%s' % (reverse(self.view_name), self.filter_param, value)
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request is not None else url
+
+def author_books_limit():
+    return getattr(settings, 'AUTHOR_BOOKS_LIMIT', 10)
+
+class AuthorSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """
+    Serializer for the Author model. Includes the author's most recent books
+    (at most ``AUTHOR_BOOKS_LIMIT``), their total and a link to the full,
+    paginated list.
+    """
+    books = CappedListSerializer(
+        child=BookSerializer(),
+        limit=author_books_limit,
+        ordering=('-publication_year', '-id'),
+        read_only=True,
+    )
+    book_count = RelatedCountField(source='books')
+    books_url = FilteredListLinkField('book-list', 'author')
 
     class Meta:
         model = Author
-        fields = ['id', 'name', 'books']
+        fields = ['id', 'name', 'books', 'book_count', 'books_url']
+
+
+class CachedAuthorField(serializers.PrimaryKeyRelatedField):
+    """
+    Author primary key field that resolves ids from ``context['authors']``
+    (a dict of pk to Author loaded up front) instead of querying per row.
+    """
+    def to_internal_value(self, data):
+        pk = parse_pk(data, Author)
+        if pk is None:
+            if isinstance(data, int) and not isinstance(data, bool):
+                self.fail('does_not_exist', pk_value=data)
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        author = self.context['authors'].get(pk)
+        if author is None:
+            self.fail('does_not_exist', pk_value=data)
+        return author
+
+class BookBatchRowSerializer(BookSerializer):
+    """
+    Validates a single row of a batch request. Authors must be preloaded
+    into the serializer context (see BookBatchView).
+    """
+    author = CachedAuthorField(queryset=Author.objects.all())
+
+class ChangeSerializer(serializers.ModelSerializer):
+    """
+    One change feed entry: the entry's cursor and the changed object.
+    """
+    cursor = serializers.IntegerField(source='id')
+    type = serializers.CharField(source='resource')
+    id = serializers.IntegerField(source='object_id')
+
+    class Meta:
+        model = Change
+        fields = ['cursor', 'type', 'id', 'action', 'changed_at']
+
+
+class FastReadSerializer:
+    """
+    Read-only serializer building output dicts straight from ``.values()``
+    rows, skipping the per-row ModelSerializer field machinery.
+
+    Only usable when every field of the (already shaped) serializer maps to
+    one column and renders the database value unchanged: plain character,
+    integer, boolean and float fields and pk-only foreign keys. The output
+    is then identical to the serializer's, key order included.
+    ``from_serializer()`` returns None for anything else, and callers fall
+    back to the regular serializer.
+    """
+    simple_fields = (serializers.CharField, serializers.IntegerField, serializers.BooleanField, serializers.FloatField)
+
+    def __init__(self, columns):
+        # (output key, values() lookup) pairs in serializer field order.
+        self.columns = columns
+        self.lookups = [lookup for _, lookup in columns]
+
+    @classmethod
+    def from_serializer(cls, serializer):
+        if type(serializer).to_representation is not serializers.Serializer.to_representation:
+            return None
+        model = serializer.Meta.model
+        columns = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if not cls.is_simple(field) or '.' in field.source or field.source == '*':
+                return None
+            try:
+                model_field = model._meta.get_field(field.source)
+            except FieldDoesNotExist:
+                return None
+            if not model_field.concrete or model_field.many_to_many:
+                return None
+            columns.append((name, field.source))
+        return cls(columns)
+
+    @classmethod
+    def is_simple(cls, field):
+        if isinstance(field, serializers.PrimaryKeyRelatedField):
+            return (
+                field.pk_field is None
+                and type(field).to_representation is serializers.PrimaryKeyRelatedField.to_representation
+            )
+        if isinstance(field, serializers.BigIntegerField):
+            # Renders like IntegerField unless big integers are sent as strings.
+            return (
+                type(field).to_representation is serializers.BigIntegerField.to_representation
+                and not getattr(field, 'coerce_to_string', api_settings.COERCE_BIGINT_TO_STRING)
+            )
+        for base in cls.simple_fields:
+            if isinstance(field, base) and type(field).to_representation is base.to_representation:
+                return True
+        return False
+
+    def values(self, queryset):
+        # Annotations (e.g. a search rank used for ordering and cursors)
+        # are kept; values() would otherwise turn them into bare aliases.
+        return queryset.values(*self.lookups, *queryset.query.annotation_select)
+
+    def to_representation(self, row):
+        return {name: row[lookup] for name, lookup in self.columns}
+
+    def many(self, rows):
+        columns = self.columns
+        return [{name: row[lookup] for name, lookup in columns} for row in rows]
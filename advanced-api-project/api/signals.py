@@ -0,0 +1,49 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Author, Book, Change
+from . import search
+from .changes import record_changes
+from .cache import invalidate_book_lists
+
+def writes_any(update_fields, *names):
+    # update_fields is None for inserts and untracked full saves.
+    return update_fields is None or not update_fields.isdisjoint(names)
+
+@receiver(post_save, sender=Book)
+def index_book(sender, instance, update_fields=None, **kwargs):
+    if writes_any(update_fields, 'title', 'author'):
+        search.index_books([instance.pk])
+
+@receiver(post_delete, sender=Book)
+def unindex_book(sender, instance, **kwargs):
+    search.unindex_books([instance.pk])
+
+@receiver(post_save, sender=Book)
+@receiver(post_delete, sender=Book)
+def touch_book_authors(sender, instance, **kwargs):
+    # AuthorSerializer embeds the books, so the author's version moves too.
+    # A moved book changes its previous author as well.
+    author_ids = {instance.author_id, instance.loaded_values.get('author_id')}
+    Author.objects.filter(pk__in=author_ids - {None}).touch()
+
+@receiver(post_save, sender=Author)
+def reindex_author_books(sender, instance, created, update_fields=None, **kwargs):
+    if not created and writes_any(update_fields, 'name'):
+        search.reindex_author(instance.pk)
+
+@receiver(post_save, sender=Book)
+@receiver(post_delete, sender=Book)
+@receiver(post_save, sender=Author)
+@receiver(post_delete, sender=Author)
+def invalidate_cached_lists(sender, **kwargs):
+    invalidate_book_lists()
+
+@receiver(post_save, sender=Book)
+@receiver(post_save, sender=Author)
+def record_save(sender, instance, created, **kwargs):
+    record_changes(sender, [instance.pk], Change.CREATED if created else Change.UPDATED)
+
+@receiver(post_delete, sender=Book)
+@receiver(post_delete, sender=Author)
+def record_delete(sender, instance, **kwargs):
+    record_changes(sender, [instance.pk], Change.DELETED)
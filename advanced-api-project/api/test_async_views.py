@@ -0,0 +1,110 @@
+from asgiref.sync import iscoroutinefunction
+from django.contrib.auth.models import User
+from django.urls import resolve, reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from .models import Book, Author
+from .testing import QueryBudgetTestMixin
+
+class AsyncViewTests(QueryBudgetTestMixin, APITestCase):
+    """
+    Tests for the async variants of the Book and Author views.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='testuser', password='testpassword')
+        cls.author = Author.objects.create(name='Async Author')
+        cls.other = Author.objects.create(name='Other Writer')
+        cls.book1 = Book.objects.create(title='Awaiting Godot', author=cls.author, publication_year=1953)
+        cls.book2 = Book.objects.create(title='Concurrency', author=cls.other, publication_year=2001)
+
+    def test_views_are_coroutines(self):
+        """
+        Ensure the async routes resolve to coroutine views.
+        """
+        for name, args in (('async-book-list', []), ('async-author-detail', [self.author.id])):
+            self.assertTrue(iscoroutinefunction(resolve(reverse(name, args=args)).func))
+
+    def test_list_matches_sync_view(self):
+        """
+        Ensure filtering, search, ordering and pagination match the sync list.
+        """
+        for query in ('', '?ordering=-publication_year', '?search=godot', '?publication_year=2001',
+                      '?author=%d' % self.author.id, '?expand=author', '?page_size=1'):
+            with self.subTest(query=query):
+                sync = self.client.get(reverse('book-list') + query, format='json')
+                response = self.client.get(reverse('async-book-list') + query, format='json')
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(response.data['results'], sync.data['results'])
+
+    def test_detail_and_author_views(self):
+        """
+        Ensure retrieve works for books and authors with nested books.
+        """
+        response = self.client.get(reverse('async-book-detail', args=[self.book1.id]), format='json')
+        self.assertEqual(response.data['title'], 'Awaiting Godot')
+        response = self.client.get(reverse('async-author-detail', args=[self.author.id]), format='json')
+        self.assertEqual(response.data['books'][0]['title'], 'Awaiting Godot')
+        response = self.client.get(reverse('async-book-detail', args=[0]), format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_writes_require_authentication(self):
+        """
+        Ensure the write views keep their permission checks.
+        """
+        data = {'title': 'Anonymous', 'author': self.author.id, 'publication_year': 2000}
+        response = self.client.post(reverse('async-book-create'), data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        response = self.client.delete(reverse('async-book-delete', args=[self.book1.id]))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_create_update_delete(self):
+        """
+        Ensure authenticated users can create, update and delete through the async views.
+        """
+        self.client.login(username='testuser', password='testpassword')
+        data = {'title': 'Async Book', 'author': self.author.id, 'publication_year': 2020}
+        response = self.client.post(reverse('async-book-create'), data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        book_id = response.data['id']
+
+        response = self.client.post(reverse('async-book-create'), dict(data, publication_year=3000), format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.patch(reverse('async-book-update', args=[book_id]), {'title': 'Awaited'}, format='json')
+        self.assertEqual(response.data['title'], 'Awaited')
+        self.assertEqual(Book.objects.get(pk=book_id).title, 'Awaited')
+
+        response = self.client.patch(reverse('async-author-detail', args=[self.author.id]), {'name': 'Renamed'}, format='json')
+        self.assertEqual(response.data['name'], 'Renamed')
+        self.assertEqual(len(response.data['books']), 2)
+
+        response = self.client.delete(reverse('async-book-delete', args=[book_id]))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        response = self.client.delete(reverse('async-author-detail', args=[self.other.id]))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Book.objects.filter(pk=self.book2.pk).exists())
+
+    def test_query_budgets(self):
+        """
+        Ensure the async list and detail views stay within their budgets.
+        """
+        def book_list(size):
+            Book.objects.bulk_create(
+                Book(title='Budget %d' % i, author=self.author, publication_year=2000) for i in range(size)
+            )
+            return reverse('async-book-list') + '?search=budget', None
+        self.assertQueryBudget('GET', book_list)
+
+        def author_list(size):
+            Author.objects.bulk_create(Author(name='Budget %d' % i) for i in range(size))
+            return reverse('async-author-list'), None
+        self.assertQueryBudget('GET', author_list)
+
+    async def test_async_client(self):
+        """
+        Ensure the views run natively under the async test client.
+        """
+        response = await self.async_client.get(reverse('async-book-list') + '?ordering=title')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['title'] for row in response.json()['results']], ['Awaiting Godot', 'Concurrency'])
@@ -0,0 +1,131 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from .models import Book, Author
+
+class BookBatchTests(APITestCase):
+    """
+    Tests for the batch create/update endpoint.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='testuser', password='testpassword')
+        cls.author = Author.objects.create(name='Batch Author')
+        cls.other = Author.objects.create(name='Other Author')
+        cls.book = Book.objects.create(title='Existing', author=cls.author, publication_year=2000)
+
+    def setUp(self):
+        self.client.login(username='testuser', password='testpassword')
+        self.url = reverse('book-batch')
+
+    def test_unauthenticated(self):
+        """
+        Ensure unauthenticated users cannot use the batch endpoint.
+        """
+        self.client.logout()
+        response = self.client.post(self.url, [], format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_create_and_update(self):
+        """
+        Ensure new rows are created, rows with an id are updated, and each row gets a status.
+        """
+        data = [
+            {'title': 'New 1', 'author': self.author.id, 'publication_year': 2010},
+            {'id': self.book.id, 'title': 'Renamed', 'author': self.other.id},
+            {'title': 'New 2', 'author': self.other.id, 'publication_year': 2011},
+        ]
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data['created'], response.data['updated'], response.data['failed']), (2, 1, 0))
+        self.assertEqual([row['status'] for row in response.data['results']], ['created', 'updated', 'created'])
+        self.assertEqual(Book.objects.count(), 3)
+        self.book.refresh_from_db()
+        self.assertEqual((self.book.title, self.book.author, self.book.publication_year), ('Renamed', self.other, 2000))
+        self.assertTrue(Book.objects.filter(pk=response.data['results'][0]['id'], title='New 1').exists())
+
+    def test_invalid_rows_are_reported(self):
+        """
+        Ensure invalid rows are reported per row while valid rows are still written.
+        """
+        data = [
+            {'title': 'Good', 'author': self.author.id, 'publication_year': 2010},
+            {'title': 'Future', 'author': self.author.id, 'publication_year': 9999},
+            {'title': 'No author', 'author': 123456, 'publication_year': 2010},
+            {'id': 123456, 'title': 'Missing'},
+        ]
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        statuses = [row['status'] for row in response.data['results']]
+        self.assertEqual(statuses, ['created', 'invalid', 'invalid', 'invalid'])
+        self.assertIn('publication_year', response.data['results'][1]['errors'])
+        self.assertIn('author', response.data['results'][2]['errors'])
+        self.assertIn('id', response.data['results'][3]['errors'])
+        self.assertEqual(Book.objects.count(), 2)
+
+    def test_malformed_ids_are_reported(self):
+        """
+        Ensure float, Unicode-digit and out-of-range ids are invalid rows
+        rather than truncated or passed to the query.
+        """
+        huge = 99999999999999999999999
+        data = [
+            {'id': self.book.id + 0.7, 'title': 'Truncated'},
+            {'id': '\u00b2', 'title': 'Superscript'},
+            {'id': huge, 'title': 'Huge'},
+            {'title': 'Float author', 'author': self.author.id + 0.7, 'publication_year': 2010},
+            {'title': 'Huge author', 'author': huge, 'publication_year': 2010},
+            {'title': 'Good', 'author': str(self.author.id), 'publication_year': 2010},
+        ]
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        statuses = [row['status'] for row in response.data['results']]
+        self.assertEqual(statuses, ['invalid'] * 5 + ['created'])
+        for result in response.data['results'][:3]:
+            self.assertIn('id', result['errors'])
+        for result in response.data['results'][3:5]:
+            self.assertIn('author', result['errors'])
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.title, 'Existing')
+
+    def test_duplicate_ids_are_rejected(self):
+        """
+        Ensure the same book cannot be updated twice in one batch.
+        """
+        data = [{'id': self.book.id, 'title': 'One'}, {'id': self.book.id, 'title': 'Two'}]
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual([row['status'] for row in response.data['results']], ['updated', 'invalid'])
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.title, 'One')
+
+    def post_counting_queries(self, data):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(queries)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        """
+        Ensure a large batch runs the same number of queries as a tiny one.
+        """
+        def batch(size, year):
+            rows = [
+                {'title': 'Bulk %d' % i, 'author': self.author.id if i % 2 else self.other.id, 'publication_year': year}
+                for i in range(size)
+            ]
+            return rows + [{'id': self.book.id, 'publication_year': year}]
+
+        small = self.post_counting_queries(batch(1, 2001))
+        large = self.post_counting_queries(batch(200, 2002))
+        self.assertEqual(small, large)
+        self.assertEqual(Book.objects.count(), 202)
+
+    def test_rejects_non_list_body(self):
+        """
+        Ensure the body must be a list of objects.
+        """
+        response = self.client.post(self.url, {'title': 'x'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
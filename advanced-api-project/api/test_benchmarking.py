@@ -0,0 +1,39 @@
+from django.urls import reverse
+from rest_framework.test import APIClient, APITestCase
+from .benchmarking import Scenario, measure, percentile
+from .models import Book, Author
+
+class BenchmarkingTests(APITestCase):
+    """
+    Tests for the helpers behind the benchmark_endpoints command.
+    """
+    def test_percentile(self):
+        """
+        Ensure percentiles use the nearest-rank method.
+        """
+        samples = list(range(100, 0, -1))
+        self.assertEqual(percentile(samples, 50), 50)
+        self.assertEqual(percentile(samples, 99), 99)
+        self.assertEqual(percentile([7], 95), 7)
+
+    def test_measure_reports_latency_queries_and_memory(self):
+        """
+        Ensure a scenario run records latency percentiles, query counts and peak memory.
+        """
+        author = Author.objects.create(name='Bench Author')
+        book = Book.objects.create(title='Bench', author=author, publication_year=2000)
+        url = reverse('book-detail', args=[book.id])
+        scenario = Scenario('book-detail', 'book-detail', 'GET', lambda: (url, None))
+        result = measure(scenario, APIClient(), requests=5, profile_requests=2)
+        self.assertEqual(result['requests'], 5)
+        self.assertLessEqual(result['latency_ms']['p50'], result['latency_ms']['p99'])
+        self.assertEqual(result['queries'], {'min': 1, 'max': 1, 'mean': 1.0})
+        self.assertGreater(result['peak_memory_kb'], 0)
+
+    def test_measure_rejects_error_responses(self):
+        """
+        Ensure a failing scenario aborts instead of timing error pages.
+        """
+        scenario = Scenario('missing', 'book-detail', 'GET', lambda: (reverse('book-detail', args=[0]), None))
+        with self.assertRaises(RuntimeError):
+            measure(scenario, APIClient(), requests=1, profile_requests=0)
@@ -0,0 +1,83 @@
+import json
+from unittest import mock
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from .models import Book, Author, Change
+from .views import BookBulkDeleteView
+
+class BookBulkDeleteTests(APITestCase):
+    """
+    Tests for deleting books by filter in chunks.
+    """
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.author = Author.objects.create(name='Backlist Author')
+        self.other = Author.objects.create(name='Kept Author')
+        Book.objects.bulk_create(
+            Book(title='Backlist %d' % i, author=self.author, publication_year=1990) for i in range(12)
+        )
+        self.kept = Book.objects.create(title='Kept', author=self.other, publication_year=1990)
+        self.url = reverse('book-bulk-delete')
+
+    def test_requires_authentication(self):
+        """
+        Ensure anonymous users cannot bulk delete.
+        """
+        response = self.client.delete(self.url + '?author=%d' % self.author.id)
+        self.assertIn(response.status_code, (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN))
+        self.assertEqual(Book.objects.count(), 13)
+
+    def test_requires_a_filter(self):
+        """
+        Ensure an unfiltered request does not delete every book.
+        """
+        self.client.force_authenticate(self.user)
+        response = self.client.delete(self.url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Book.objects.count(), 13)
+
+    def test_blank_filters_are_not_filters(self):
+        """
+        Ensure blank filter values, which the backends ignore, do not count as a filter.
+        """
+        self.client.force_authenticate(self.user)
+        for query in ('?title=', '?search=', '?author=', '?search=%20&publication_year='):
+            with self.subTest(query=query):
+                response = self.client.delete(self.url + query)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Book.objects.count(), 13)
+
+    def test_raw_delete_skips_no_cascade(self):
+        """
+        Ensure nothing references Book, so raw deletes skip no cascades.
+        """
+        self.assertEqual(Book._meta.related_objects, ())
+
+    def test_deletes_matching_books_in_chunks(self):
+        """
+        Ensure only matching books are deleted, chunk by chunk, with their side effects.
+        """
+        self.client.force_authenticate(self.user)
+        with mock.patch.object(BookBulkDeleteView, 'chunk_size', 5):
+            response = self.client.delete(self.url + '?author=%d&format=ndjson' % self.author.id)
+            lines = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual(lines, [
+            {'deleted': 5, 'done': False}, {'deleted': 10, 'done': False},
+            {'deleted': 12, 'done': False}, {'deleted': 12, 'done': True},
+        ])
+        self.assertEqual(list(Book.objects.all()), [self.kept])
+        self.assertEqual(Change.objects.filter(resource='book', action=Change.DELETED).count(), 12)
+        search = self.client.get(reverse('book-list') + '?search=backlist', format='json')
+        self.assertEqual(search.data['results'], [])
+
+    def test_json_reports_total(self):
+        """
+        Ensure the plain JSON response reports the number deleted.
+        """
+        self.client.force_authenticate(self.user)
+        response = self.client.delete(self.url + '?title=Kept')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'deleted': 1})
+        self.assertEqual(Book.objects.count(), 12)
@@ -0,0 +1,137 @@
+import threading
+import time
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APITransactionTestCase
+from .cache import single_flight
+from .models import Book, Author
+
+class BookListCacheTests(APITransactionTestCase):
+    """
+    Tests for the Book list response cache. These run outside a wrapping
+    transaction because the cache is bypassed inside one.
+    """
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.author = Author.objects.create(name='Cache Author')
+        self.book = Book.objects.create(title='Cached', author=self.author, publication_year=2020)
+
+    def get(self, query=''):
+        response = self.client.get(reverse('book-list') + query, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def test_repeat_request_is_served_from_cache(self):
+        """
+        Ensure a repeated anonymous request does not touch the database.
+        """
+        first = self.get('?ordering=title')
+        with self.assertNumQueries(0):
+            second = self.get('?ordering=title')
+        self.assertEqual(first.data, second.data)
+
+    def test_query_string_is_normalized(self):
+        """
+        Ensure parameter order does not split the cache.
+        """
+        self.get('?publication_year=2020&ordering=title')
+        with self.assertNumQueries(0):
+            response = self.get('?ordering=title&publication_year=2020')
+        self.assertEqual(len(response.data['results']), 1)
+
+    def test_book_write_invalidates(self):
+        """
+        Ensure creating, updating and deleting books invalidates cached lists.
+        """
+        self.get()
+        Book.objects.create(title='Second', author=self.author, publication_year=2021)
+        self.assertEqual(len(self.get().data['results']), 2)
+        self.book.title = 'Renamed'
+        self.book.save()
+        self.assertIn('Renamed', [row['title'] for row in self.get().data['results']])
+        self.book.delete()
+        self.assertEqual(len(self.get().data['results']), 1)
+
+    def test_author_write_invalidates(self):
+        """
+        Ensure author changes invalidate cached lists (search covers author names).
+        """
+        self.assertEqual(len(self.get('?search=author').data['results']), 1)
+        self.author.name = 'Renamed Writer'
+        self.author.save()
+        self.assertEqual(len(self.get('?search=author').data['results']), 0)
+
+    def test_batch_write_invalidates(self):
+        """
+        Ensure bulk writes through the batch endpoint invalidate cached lists.
+        """
+        self.get()
+        self.client.login(username='testuser', password='testpassword')
+        data = [{'title': 'Batched', 'author': self.author.id, 'publication_year': 2022}]
+        self.client.post(reverse('book-batch'), data, format='json')
+        self.client.logout()
+        self.assertEqual(len(self.get().data['results']), 2)
+
+    def test_auth_state_is_part_of_the_key(self):
+        """
+        Ensure anonymous and authenticated requests are cached separately.
+        """
+        self.get()
+        self.client.login(username='testuser', password='testpassword')
+        with self.assertNumQueries(4):
+            # Session and user lookups, then the count and page queries.
+            self.get()
+
+class SingleFlightTests(APITestCase):
+    """
+    Tests for the single-flight cache helper.
+    """
+    def setUp(self):
+        cache.clear()
+
+    def test_concurrent_misses_compute_once(self):
+        """
+        Ensure a burst of misses on one key runs the computation only once.
+        """
+        calls = []
+        results = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)
+            return 'value'
+
+        def worker():
+            results.append(single_flight('test:single-flight', compute, 60))
+
+        threads = [threading.Thread(target=worker) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ['value'] * 5)
+
+    def test_failed_leader_releases_lock(self):
+        """
+        Ensure an exception in the computation does not leave the key locked.
+        """
+        def fail():
+            raise RuntimeError('boom')
+
+        with self.assertRaises(RuntimeError):
+            single_flight('test:failing', fail, 60)
+        self.assertEqual(single_flight('test:failing', lambda: 'ok', 60), 'ok')
+
+    def test_cache_bypassed_inside_transaction(self):
+        """
+        Ensure lists read inside a transaction are neither cached nor served from cache.
+        """
+        author = Author.objects.create(name='Atomic Author')
+        Book.objects.create(title='Atomic', author=author, publication_year=2020)
+        self.client.get(reverse('book-list'), format='json')
+        with self.assertNumQueries(2):
+            self.client.get(reverse('book-list'), format='json')
@@ -0,0 +1,121 @@
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from .changes import trim_changes
+from .models import Book, Author, Change
+
+class ChangeFeedTests(APITestCase):
+    """
+    Tests for the change log and the change feed endpoint.
+    """
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.author = Author.objects.create(name='Feed Author')
+        self.book = Book.objects.create(title='Feed', author=self.author, publication_year=2000)
+
+    def feed(self, since=None, **params):
+        if since is not None:
+            params['since'] = since
+        return self.client.get(reverse('change-feed'), params, format='json')
+
+    def entries(self, response):
+        return [(row['type'], row['id'], row['action']) for row in response.data['results']]
+
+    def test_feed_lists_changes_in_order(self):
+        """
+        Ensure inserts, updates and deletes appear in order with a new cursor.
+        """
+        start = self.feed().data['cursor']
+        other = Book.objects.create(title='Other', author=self.author, publication_year=2001)
+        self.book.title = 'Renamed'
+        self.book.save()
+        other_id = other.id
+        other.delete()
+        response = self.feed(start)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.entries(response), [
+            # Touching the author on each book write does not record it.
+            ('book', self.book.id, 'updated'),
+            ('book', other_id, 'deleted'),
+        ])
+        self.assertFalse(response.data['has_more'])
+        self.assertEqual(self.feed(response.data['cursor']).data['results'], [])
+
+    def test_log_is_compacted(self):
+        """
+        Ensure each object keeps only its latest entry.
+        """
+        for year in range(2001, 2006):
+            self.book.publication_year = year
+            self.book.save()
+        self.assertEqual(Change.objects.filter(resource='book', object_id=self.book.id).count(), 1)
+        self.assertEqual(self.entries(self.feed(0)), [
+            ('author', self.author.id, 'created'),
+            ('book', self.book.id, 'updated'),
+        ])
+
+    def test_pages_with_limit(self):
+        """
+        Ensure ?limit= pages through the feed with has_more.
+        """
+        Book.objects.create(title='Second', author=self.author, publication_year=2001)
+        first = self.feed(0, limit=2)
+        self.assertEqual(len(first.data['results']), 2)
+        self.assertTrue(first.data['has_more'])
+        second = self.feed(first.data['cursor'], limit=2)
+        self.assertEqual([row['title'] for row in Book.objects.filter(
+            id__in=[row['id'] for row in second.data['results']]).values('title')], ['Second'])
+        self.assertFalse(second.data['has_more'])
+
+    def test_bulk_writes_are_recorded(self):
+        """
+        Ensure the batch endpoint and author deletion record every book.
+        """
+        start = self.feed().data['cursor']
+        self.client.login(username='testuser', password='testpassword')
+        data = [{'title': 'Batched', 'author': self.author.id, 'publication_year': 2002},
+                {'id': self.book.id, 'title': 'Batch renamed'}]
+        created = self.client.post(reverse('book-batch'), data, format='json').data['results'][0]['id']
+        self.assertEqual(sorted(self.entries(self.feed(start))), [
+            ('book', self.book.id, 'updated'), ('book', created, 'created'),
+        ])
+        self.client.delete(reverse('author-detail', args=[self.author.id]))
+        self.assertEqual(sorted(self.entries(self.feed(start))), [
+            ('author', self.author.id, 'deleted'),
+            ('book', self.book.id, 'deleted'), ('book', created, 'deleted'),
+        ])
+
+    def test_expired_tombstones_are_trimmed(self):
+        """
+        Ensure old deletions are trimmed and older cursors get 410 Gone.
+        """
+        start = self.feed().data['cursor']
+        self.book.delete()
+        Change.objects.filter(action=Change.DELETED).update(changed_at=timezone.now() - timedelta(days=31))
+        response = self.feed(start)
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+        self.assertFalse(Change.objects.filter(action=Change.DELETED).exists())
+        horizon = response.data['cursor']
+        self.assertEqual(self.feed(horizon).status_code, status.HTTP_200_OK)
+        self.assertEqual(trim_changes(), horizon)
+
+    def test_bootstrap_cursor_after_trimming(self):
+        """
+        Ensure the bootstrap cursor is never older than the trimmed horizon.
+        """
+        self.book.delete()
+        Change.objects.filter(action=Change.DELETED).update(changed_at=timezone.now() - timedelta(days=31))
+        trim_changes()
+        cursor = self.feed().data['cursor']
+        response = self.feed(cursor)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'], [])
+
+    def test_invalid_cursor(self):
+        """
+        Ensure a malformed cursor is rejected.
+        """
+        self.assertEqual(self.feed('abc').status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,115 @@
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from .models import Book, Author
+
+class ConditionalGetTests(APITestCase):
+    """
+    Tests for ETag / Last-Modified support on the detail endpoints.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='testuser', password='testpassword')
+        cls.author = Author.objects.create(name='Stamp Author')
+        cls.other = Author.objects.create(name='Other Author')
+        cls.book = Book.objects.create(title='Stamped', author=cls.author, publication_year=2001)
+
+    def get(self, url, **headers):
+        return self.client.get(url, format='json', **headers)
+
+    def test_detail_sends_validators(self):
+        """
+        Ensure detail responses carry ETag and Last-Modified.
+        """
+        response = self.get(reverse('book-detail', args=[self.book.id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.has_header('ETag'))
+        self.assertTrue(response.has_header('Last-Modified'))
+        self.assertNotIn('updated_at', response.data)
+
+    def test_if_none_match_returns_304_without_serializing(self):
+        """
+        Ensure a matching ETag gets a 304 after a single lookup query.
+        """
+        url = reverse('author-detail', args=[self.author.id])
+        etag = self.get(url)['ETag']
+        with self.assertNumQueries(1):
+            response = self.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+
+    def test_if_modified_since_returns_304(self):
+        """
+        Ensure an up-to-date If-Modified-Since gets a 304.
+        """
+        url = reverse('book-detail', args=[self.book.id])
+        last_modified = self.get(url)['Last-Modified']
+        response = self.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_book_change_changes_etag(self):
+        """
+        Ensure editing the book produces a new ETag and a full response.
+        """
+        url = reverse('book-detail', args=[self.book.id])
+        etag = self.get(url)['ETag']
+        self.client.login(username='testuser', password='testpassword')
+        self.client.patch(reverse('book-update', args=[self.book.id]), {'title': 'Restamped'}, format='json')
+        response = self.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['title'], 'Restamped')
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_book_change_changes_author_etag(self):
+        """
+        Ensure the author's version moves when one of their books changes.
+        """
+        url = reverse('author-detail', args=[self.author.id])
+        etag = self.get(url)['ETag']
+        self.book.publication_year = 2002
+        self.book.save()
+        response = self.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['books'][0]['publication_year'], 2002)
+
+    def test_moving_a_book_changes_both_authors(self):
+        """
+        Ensure reassigning a book bumps both the old and the new author.
+        """
+        old_url = reverse('author-detail', args=[self.author.id])
+        new_url = reverse('author-detail', args=[self.other.id])
+        old_etag, new_etag = self.get(old_url)['ETag'], self.get(new_url)['ETag']
+        book = Book.objects.get(pk=self.book.pk)
+        book.author = self.other
+        book.save()
+        self.assertEqual(self.get(old_url, HTTP_IF_NONE_MATCH=old_etag).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.get(new_url, HTTP_IF_NONE_MATCH=new_etag).status_code, status.HTTP_200_OK)
+
+    def test_batch_update_changes_author_etag(self):
+        """
+        Ensure bulk writes from the batch endpoint also bump the author.
+        """
+        url = reverse('author-detail', args=[self.author.id])
+        etag = self.get(url)['ETag']
+        self.client.login(username='testuser', password='testpassword')
+        self.client.post(reverse('book-batch'), [{'id': self.book.id, 'title': 'Batched'}], format='json')
+        response = self.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['books'][0]['title'], 'Batched')
+
+    def test_expanded_author_change_changes_etag(self):
+        """
+        Ensure renaming the author invalidates a book detail that embeds it, still in one query.
+        """
+        url = reverse('book-detail', args=[self.book.id]) + '?expand=author'
+        etag = self.get(url)['ETag']
+        self.assertNotEqual(etag, self.get(reverse('book-detail', args=[self.book.id]))['ETag'])
+        with self.assertNumQueries(1):
+            self.assertEqual(self.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+        self.author.name = 'Renamed Author'
+        self.author.save()
+        response = self.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['author']['name'], 'Renamed Author')
@@ -0,0 +1,78 @@
+import csv
+import io
+import json
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from .models import Book, Author
+
+class StreamingExportTests(APITestCase):
+    """
+    Tests for the NDJSON and CSV export mode of the list endpoints.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = Author.objects.create(name='Export Author')
+        cls.other = Author.objects.create(name='Other Author')
+        for i in range(30):
+            Book.objects.create(title='Book %02d' % i, author=cls.author, publication_year=1990 + i)
+        Book.objects.create(title='Elsewhere, "quoted"', author=cls.other, publication_year=2001)
+
+    def read(self, response):
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    def test_book_ndjson_export_is_unpaginated(self):
+        """
+        Ensure the NDJSON export streams every book, one object per line.
+        """
+        response = self.client.get(reverse('book-list') + '?format=ndjson')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('application/x-ndjson'))
+        lines = self.read(response).splitlines()
+        self.assertEqual(len(lines), 31)
+        self.assertEqual(set(json.loads(lines[0])), {'id', 'title', 'publication_year', 'author'})
+
+    def test_book_csv_export_honours_filters(self):
+        """
+        Ensure the CSV export applies the same filters and ordering as the list.
+        """
+        url = reverse('book-list') + '?format=csv&author=%d&ordering=-publication_year' % self.other.id
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rows = list(csv.reader(io.StringIO(self.read(response))))
+        self.assertEqual(rows[0], ['id', 'title', 'publication_year', 'author'])
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1][1], 'Elsewhere, "quoted"')
+
+    def test_export_with_accept_header(self):
+        """
+        Ensure the export can be selected through content negotiation.
+        """
+        response = self.client.get(reverse('book-list'), HTTP_ACCEPT='application/x-ndjson')
+        self.assertEqual(len(self.read(response).splitlines()), 31)
+
+    def test_author_ndjson_export_includes_nested_books(self):
+        """
+        Ensure authors are exported with their (capped) nested books and totals.
+        """
+        response = self.client.get(reverse('author-list') + '?format=ndjson')
+        authors = [json.loads(line) for line in self.read(response).splitlines()]
+        self.assertEqual([len(author['books']) for author in authors], [10, 1])
+        self.assertEqual([author['book_count'] for author in authors], [30, 1])
+
+    def test_author_csv_export_encodes_nested_books(self):
+        """
+        Ensure nested values are written as JSON inside the CSV cell.
+        """
+        response = self.client.get(reverse('author-list') + '?format=csv')
+        rows = list(csv.DictReader(io.StringIO(self.read(response))))
+        self.assertEqual(len(json.loads(rows[1]['books'])), 1)
+
+    def test_json_list_is_unchanged(self):
+        """
+        Ensure the default JSON response is still paginated.
+        """
+        response = self.client.get(reverse('book-list'), format='json')
+        self.assertFalse(response.streaming)
+        self.assertIn('results', response.data)
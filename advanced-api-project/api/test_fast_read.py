@@ -0,0 +1,71 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+from .models import Book, Author
+from .serializers import AuthorSerializer, BookSerializer, FastReadSerializer
+
+class FastReadSerializerTests(APITestCase):
+    """
+    Tests for the values()-based read path of the Book list endpoint.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = Author.objects.create(name='Fast Author')
+        cls.other = Author.objects.create(name='Other Author')
+        for i in range(5):
+            Book.objects.create(title='Fast "%d" é' % i, author=cls.author, publication_year=1990 + i)
+        Book.objects.create(title='Elsewhere', author=cls.other, publication_year=2001)
+
+    def render(self, data):
+        return JSONRenderer().render(data)
+
+    def test_output_is_byte_identical(self):
+        """
+        Ensure the fast path renders exactly what BookSerializer renders.
+        """
+        queryset = Book.objects.order_by('id')
+        fast = FastReadSerializer.from_serializer(BookSerializer())
+        self.assertEqual(
+            self.render(fast.many(fast.values(queryset))),
+            self.render(BookSerializer(queryset, many=True).data),
+        )
+
+    def test_list_endpoint_matches_serializer(self):
+        """
+        Ensure list responses, with filters and sparse fieldsets, match the regular serializer.
+        """
+        for query, queryset in (
+            ('?ordering=-publication_year', Book.objects.order_by('-publication_year', '-id')),
+            ('?author=%d' % self.author.id, Book.objects.filter(author=self.author).order_by('id')),
+        ):
+            response = self.client.get(reverse('book-list') + query, format='json')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(
+                self.render(response.data['results']),
+                self.render(BookSerializer(queryset, many=True).data),
+            )
+
+        response = self.client.get(reverse('book-list') + '?fields=title,author&page_size=2', format='json')
+        self.assertEqual(response.data['results'], [
+            {'title': book.title, 'author': book.author_id} for book in Book.objects.order_by('id')[:2]
+        ])
+        second = self.client.get(response.data['next'], format='json')
+        self.assertEqual(second.data['results'][0]['title'], Book.objects.order_by('id')[2].title)
+
+    def test_list_uses_values_rows(self):
+        """
+        Ensure plain list reads are served by the fast path.
+        """
+        self.assertIsNotNone(FastReadSerializer.from_serializer(BookSerializer()))
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('book-list'), format='json')
+        self.assertIs(type(response.data['results'][0]), dict)
+
+    def test_unsupported_serializers_fall_back(self):
+        """
+        Ensure expanded relations and nested serializers are not served by the fast path.
+        """
+        self.assertIsNone(FastReadSerializer.from_serializer(AuthorSerializer()))
+        response = self.client.get(reverse('book-list') + '?expand=author', format='json')
+        self.assertEqual(response.data['results'][0]['author'], {'id': self.author.id, 'name': 'Fast Author'})
@@ -0,0 +1,142 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from .models import Book, Author
+
+class SparseFieldsetTests(APITestCase):
+    """
+    Tests for the ?fields= and ?expand= query parameters.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = Author.objects.create(name='Sparse Author')
+        for i in range(3):
+            Book.objects.create(title='Sparse %d' % i, author=cls.author, publication_year=2000 + i)
+        cls.book = Book.objects.first()
+
+    def get(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, [query['sql'] for query in queries.captured_queries]
+
+    def test_book_list_fields(self):
+        """
+        Ensure ?fields= shrinks both the payload and the selected columns.
+        """
+        response, queries = self.get(reverse('book-list') + '?fields=id,title')
+        self.assertEqual(set(response.data['results'][0]), {'id', 'title'})
+        # The capped count, then the page itself.
+        self.assertEqual(len(queries), 2)
+        self.assertNotIn('publication_year', queries[1])
+
+    def test_fields_with_ordering_on_dropped_field(self):
+        """
+        Ensure ordering on a field left out of the fieldset still paginates.
+        """
+        response, queries = self.get(reverse('book-list') + '?fields=title&ordering=-publication_year&page_size=2')
+        self.assertEqual([row['title'] for row in response.data['results']], ['Sparse 2', 'Sparse 1'])
+        self.assertEqual(len(queries), 2)
+        self.assertIsNotNone(response.data['next'])
+
+    def test_book_detail_expand_author(self):
+        """
+        Ensure ?expand=author embeds the author through a join.
+        """
+        response, queries = self.get(reverse('book-detail', args=[self.book.id]) + '?expand=author')
+        self.assertEqual(response.data['author'], {'id': self.author.id, 'name': 'Sparse Author'})
+        self.assertEqual(len(queries), 1)
+
+    def test_expand_and_select_nested_fields(self):
+        """
+        Ensure dotted paths select fields inside an expanded relation.
+        """
+        url = reverse('book-list') + '?expand=author&fields=title,author.name'
+        response, queries = self.get(url)
+        self.assertEqual(response.data['results'][0], {'title': 'Sparse 0', 'author': {'name': 'Sparse Author'}})
+        self.assertEqual(len(queries), 2)
+
+    def test_author_fields_skip_nested_books(self):
+        """
+        Ensure leaving books out of the fieldset skips the prefetch entirely.
+        """
+        response, queries = self.get(reverse('author-list') + '?fields=id,name')
+        self.assertEqual(response.data, [{'id': self.author.id, 'name': 'Sparse Author'}])
+        self.assertEqual(len(queries), 1)
+
+    def test_author_nested_book_fields(self):
+        """
+        Ensure nested book fields can be selected with dotted paths.
+        """
+        response, queries = self.get(reverse('author-detail', args=[self.author.id]) + '?fields=name,books.title')
+        self.assertEqual(response.data['books'][0], {'title': 'Sparse 2'})
+        self.assertEqual(len(queries), 2)
+        # publication_year orders the capped window but is not loaded.
+        self.assertNotIn('publication_year', queries[1].split(' FROM ')[0])
+
+    def test_fields_ignored_on_writes(self):
+        """
+        Ensure ?fields= does not affect validation of writes.
+        """
+        User.objects.create_user(username='testuser', password='testpassword')
+        self.client.login(username='testuser', password='testpassword')
+        url = reverse('book-create') + '?fields=title'
+        response = self.client.post(url, {'title': 'x', 'author': self.author.id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('publication_year', response.data)
+
+class CappedNestedBooksTests(APITestCase):
+    """
+    Tests for the capped nested books, book_count and books_url on authors.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.prolific = Author.objects.create(name='Prolific Author')
+        cls.single = Author.objects.create(name='Single Author')
+        cls.empty = Author.objects.create(name='Empty Author')
+        Book.objects.bulk_create(
+            Book(title='Prolific %02d' % i, author=cls.prolific, publication_year=1950 + i) for i in range(25)
+        )
+        Book.objects.create(title='Only', author=cls.single, publication_year=2000)
+
+    def test_list_caps_books_in_one_query(self):
+        """
+        Ensure the author list nests the most recent books with totals from a single prefetch.
+        """
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('author-list'), format='json')
+        authors = {author['name']: author for author in response.data}
+        prolific = authors['Prolific Author']
+        self.assertEqual(len(prolific['books']), 10)
+        self.assertEqual(prolific['books'][0]['title'], 'Prolific 24')
+        self.assertEqual(prolific['book_count'], 25)
+        self.assertEqual(prolific['books_url'], 'http://testserver/api/books/?author=%d' % self.prolific.id)
+        self.assertEqual((authors['Single Author']['book_count'], len(authors['Single Author']['books'])), (1, 1))
+        self.assertEqual((authors['Empty Author']['book_count'], authors['Empty Author']['books']), (0, []))
+
+    def test_limit_is_configurable(self):
+        """
+        Ensure AUTHOR_BOOKS_LIMIT controls how many books are nested.
+        """
+        with self.settings(AUTHOR_BOOKS_LIMIT=3):
+            response = self.client.get(reverse('author-detail', args=[self.prolific.id]), format='json')
+        self.assertEqual([book['publication_year'] for book in response.data['books']], [1974, 1973, 1972])
+
+    def test_count_without_books(self):
+        """
+        Ensure book_count alone still comes from one prefetch query.
+        """
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('author-list') + '?fields=name,book_count', format='json')
+        self.assertEqual(sorted(author['book_count'] for author in response.data), [0, 1, 25])
+
+    def test_books_url_lists_all_books(self):
+        """
+        Ensure books_url leads to the author's complete, paginated book list.
+        """
+        url = self.client.get(reverse('author-detail', args=[self.prolific.id]), format='json').data['books_url']
+        response = self.client.get(url, format='json')
+        self.assertEqual(response.data['count'], 25)
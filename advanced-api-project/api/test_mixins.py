@@ -0,0 +1,85 @@
+from django.urls import reverse
+from rest_framework import serializers, status
+from rest_framework.test import APITestCase
+from .mixins import optimize_queryset
+from .models import Book, Author
+from .serializers import AuthorSerializer, BookSerializer
+
+class QuerySetOptimizerTests(APITestCase):
+    """
+    Tests for the serializer-driven queryset optimizer.
+    """
+    def create_authors(self, count, books_each=3):
+        for i in range(count):
+            author = Author.objects.create(name='Author %d' % i)
+            for j in range(books_each):
+                Book.objects.create(title='Book %d-%d' % (i, j), author=author, publication_year=2000 + j)
+
+    def test_author_list_query_count_is_constant(self):
+        """
+        Ensure listing authors with nested books does not issue a query per author.
+        """
+        self.create_authors(1)
+        with self.assertNumQueries(2):
+            self.client.get(reverse('author-list'), format='json')
+        self.create_authors(10)
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('author-list'), format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 11)
+        self.assertEqual(len(response.data[0]['books']), 3)
+
+    def test_author_detail_prefetches_books(self):
+        """
+        Ensure the author detail endpoint loads the nested books in one query.
+        """
+        self.create_authors(1, books_each=5)
+        author = Author.objects.get()
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('author-detail', args=[author.id]), format='json')
+        self.assertEqual(len(response.data['books']), 5)
+
+    def test_only_selects_serialized_columns(self):
+        """
+        Ensure only the columns a serializer reads are selected.
+        """
+        queryset = optimize_queryset(Book.objects.all(), BookSerializer())
+        self.assertEqual(
+            queryset.query.deferred_loading,
+            (frozenset({'id', 'title', 'publication_year', 'author'}), False),
+        )
+
+    def test_nested_serializer_uses_select_related(self):
+        """
+        Ensure a nested to-one serializer becomes a select_related join.
+        """
+        class BookWithAuthorSerializer(serializers.ModelSerializer):
+            author = AuthorSerializer(read_only=True)
+
+            class Meta:
+                model = Book
+                fields = ['id', 'title', 'author']
+
+        self.create_authors(3, books_each=2)
+        queryset = optimize_queryset(Book.objects.all(), BookWithAuthorSerializer())
+        with self.assertNumQueries(2):
+            data = BookWithAuthorSerializer(queryset, many=True).data
+        self.assertEqual(len(data), 6)
+        self.assertEqual(len(data[0]['author']['books']), 2)
+
+    def test_method_fields_disable_only(self):
+        """
+        Ensure fields that cannot be mapped to columns leave the row undeferred.
+        """
+        class BookLabelSerializer(serializers.ModelSerializer):
+            label = serializers.SerializerMethodField()
+
+            class Meta:
+                model = Book
+                fields = ['id', 'label']
+
+            def get_label(self, obj):
+                return str(obj)
+
+        queryset = optimize_queryset(Book.objects.all(), BookLabelSerializer())
+        self.assertEqual(queryset.query.deferred_loading, (frozenset(), True))
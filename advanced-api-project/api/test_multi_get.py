@@ -0,0 +1,90 @@
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from .models import Book, Author
+
+class MultiGetTests(APITestCase):
+    """
+    Tests for fetching books and authors by id list (?ids= and the lookup endpoints).
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = Author.objects.create(name='Multi Author')
+        cls.other = Author.objects.create(name='Other Author')
+        cls.books = [
+            Book.objects.create(title='Multi %d' % i, author=cls.author, publication_year=2000 + i) for i in range(3)
+        ]
+
+    def test_books_by_ids_keep_request_order(self):
+        """
+        Ensure ?ids= returns the books in request order in a single query and reports missing ids.
+        """
+        ids = [self.books[2].id, 9999, self.books[0].id, self.books[2].id]
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('book-list') + '?ids=%s' % ','.join(map(str, ids)), format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['title'] for row in response.data['results']], ['Multi 2', 'Multi 0'])
+        self.assertEqual(response.data['missing'], [9999])
+
+    def test_ids_respect_fields_and_expand(self):
+        """
+        Ensure ?fields= and ?expand= shape multi-get results.
+        """
+        url = reverse('book-list') + '?ids=%d&fields=title&expand=author' % self.books[1].id
+        self.assertEqual(self.client.get(url, format='json').data['results'], [{'title': 'Multi 1'}])
+        url = reverse('book-list') + '?ids=%d&expand=author' % self.books[1].id
+        self.assertEqual(self.client.get(url, format='json').data['results'][0]['author']['name'], 'Multi Author')
+
+    def test_invalid_ids(self):
+        """
+        Ensure malformed or too many ids are rejected.
+        """
+        response = self.client.get(reverse('book-list') + '?ids=1,abc', format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(reverse('book-lookup'), {'ids': list(range(1, 1002))}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(reverse('book-lookup'), {'ids': 'nope'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(reverse('book-list') + '?ids=\u00b2', format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(reverse('book-lookup'), {'ids': ['\u00b2']}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(reverse('book-list') + '?ids=99999999999999999999999', format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(reverse('book-lookup'), {'ids': [99999999999999999999999]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_book_lookup_post(self):
+        """
+        Ensure anonymous clients can POST long id lists, with ?fields= applied.
+        """
+        ids = [book.id for book in reversed(self.books)]
+        with self.assertNumQueries(1):
+            response = self.client.post(reverse('book-lookup') + '?fields=id', {'ids': ids}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'results': [{'id': pk} for pk in ids], 'missing': []})
+
+    def test_authors_by_ids_prefetch_books(self):
+        """
+        Ensure authors fetched by id get their nested books from one prefetch.
+        """
+        with self.assertNumQueries(2):
+            response = self.client.post(
+                reverse('author-lookup'), {'ids': [self.other.id, self.author.id, 0]}, format='json',
+            )
+        self.assertEqual([author['name'] for author in response.data['results']], ['Other Author', 'Multi Author'])
+        self.assertEqual(len(response.data['results'][1]['books']), 3)
+        self.assertEqual(response.data['missing'], [0])
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('author-list') + '?ids=%d' % self.author.id, format='json')
+        self.assertEqual(response.data['results'][0]['book_count'], 3)
+
+    def test_author_list_post_still_creates(self):
+        """
+        Ensure POST on the author list still creates rather than looking up.
+        """
+        user = User.objects.create_user(username='testuser', password='testpassword')
+        self.client.force_authenticate(user)
+        response = self.client.post(reverse('author-list'), {'name': 'Created'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
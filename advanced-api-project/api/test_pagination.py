@@ -0,0 +1,168 @@
+import json
+from base64 import b64encode
+from unittest import mock
+from urllib.parse import parse_qs, urlencode, urlparse
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from .models import Book, Author
+from .pagination import BookCursorPagination
+
+class BookPaginationTests(APITestCase):
+    """
+    Tests for keyset pagination on the book list endpoint.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Create two authors and enough books to span several pages, with
+        duplicate titles and years so the id tiebreaker is exercised.
+        """
+        cls.author = Author.objects.create(name='First Author')
+        cls.other = Author.objects.create(name='Second Author')
+        for i in range(25):
+            Book.objects.create(
+                title='Title %d' % (i % 5),
+                author=cls.author if i % 2 else cls.other,
+                publication_year=2000 + i % 3,
+            )
+
+    def collect(self, url):
+        """
+        Follow next links from url and return every title-and-id seen.
+        """
+        seen = []
+        while url:
+            response = self.client.get(url, format='json')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen.extend((row['title'], row['id']) for row in response.data['results'])
+            url = response.data['next']
+        return seen
+
+    def test_first_page(self):
+        """
+        Ensure the first page is limited and links only forward.
+        """
+        response = self.client.get(reverse('book-list') + '?page_size=10', format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 10)
+        self.assertIsNotNone(response.data['next'])
+        self.assertIsNone(response.data['previous'])
+
+    def test_walk_all_pages_by_id(self):
+        """
+        Ensure following next links visits every book exactly once.
+        """
+        seen = self.collect(reverse('book-list') + '?page_size=7')
+        ids = [book_id for _, book_id in seen]
+        self.assertEqual(ids, list(Book.objects.order_by('id').values_list('id', flat=True)))
+
+    def test_walk_all_pages_with_duplicate_titles(self):
+        """
+        Ensure ordering on a non-unique field neither skips nor repeats rows.
+        """
+        seen = self.collect(reverse('book-list') + '?ordering=-title&page_size=4')
+        expected = list(Book.objects.order_by('-title', '-id').values_list('title', 'id'))
+        self.assertEqual(seen, expected)
+
+    def test_previous_link_returns_previous_page(self):
+        """
+        Ensure the previous link of the second page returns the first page.
+        """
+        url = reverse('book-list') + '?ordering=publication_year&page_size=6'
+        first = self.client.get(url, format='json')
+        second = self.client.get(first.data['next'], format='json')
+        back = self.client.get(second.data['previous'], format='json')
+        self.assertEqual(back.data['results'], first.data['results'])
+
+    def test_pagination_with_filter_and_search(self):
+        """
+        Ensure pagination works together with filtering and searching.
+        """
+        url = reverse('book-list') + '?author=%d&search=Title&page_size=3' % self.author.id
+        seen = self.collect(url)
+        expected = list(Book.objects.filter(author=self.author).order_by('id').values_list('title', 'id'))
+        self.assertEqual(seen, expected)
+
+    def test_invalid_cursor(self):
+        """
+        Ensure a malformed cursor is rejected.
+        """
+        response = self.client.get(reverse('book-list') + '?cursor=garbage', format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_tampered_cursor(self):
+        """
+        Ensure a cursor whose values do not fit the ordering is rejected,
+        including one issued for a different ordering.
+        """
+        for position in (['x'], [None], [99999999999999999999999]):
+            cursor = b64encode(urlencode({'p': json.dumps(position)}).encode('ascii')).decode('ascii')
+            response = self.client.get(reverse('book-list'), {'cursor': cursor}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(reverse('book-list') + '?ordering=title&page_size=3', format='json')
+        cursor = parse_qs(urlparse(response.data['next']).query)['cursor'][0]
+        response = self.client.get(reverse('book-list'), {'ordering': 'publication_year', 'cursor': cursor}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+class BookCountTests(APITestCase):
+    """
+    Tests for the capped/estimated total reported by the book list.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = Author.objects.create(name='Count Author')
+        Book.objects.bulk_create(
+            Book(title='Count %02d' % i, author=cls.author, publication_year=2000 + i % 2) for i in range(30)
+        )
+
+    def get(self, query=''):
+        response = self.client.get(reverse('book-list') + query, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_first_page_reports_exact_count_under_cap(self):
+        """
+        Ensure small results report their exact size, filters included.
+        """
+        data = self.get('?page_size=5')
+        self.assertEqual((data['count'], data['count_exact']), (30, True))
+        data = self.get('?publication_year=2001')
+        self.assertEqual((data['count'], data['count_exact']), (15, True))
+
+    def test_later_pages_skip_the_count(self):
+        """
+        Ensure following a cursor does not count again unless asked to.
+        """
+        first = self.get('?page_size=5')
+        with self.assertNumQueries(1):
+            second = self.client.get(first['next'], format='json').data
+        self.assertIsNone(second['count'])
+        third = self.client.get(second['next'] + '&count=exact', format='json').data
+        self.assertEqual((third['count'], third['count_exact']), (30, True))
+
+    @mock.patch.object(BookCursorPagination, 'count_cap', 10)
+    def test_count_is_capped(self):
+        """
+        Ensure counting stops at the cap and reports an inexact total.
+        """
+        data = self.get('?publication_year=2000&page_size=5')
+        self.assertEqual((data['count'], data['count_exact']), (10, False))
+        self.assertIsNotNone(data['next'])
+        data = self.get('?publication_year=2000&count=exact')
+        self.assertEqual((data['count'], data['count_exact']), (15, True))
+
+    @mock.patch.object(BookCursorPagination, 'count_cap', 10)
+    def test_unfiltered_count_uses_table_statistics(self):
+        """
+        Ensure an unfiltered query past the cap reports the planner's estimate when there is one.
+        """
+        data = self.get()
+        self.assertEqual((data['count'], data['count_exact']), (10, False))
+        if connection.vendor != 'sqlite':
+            return
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        data = self.get()
+        self.assertEqual((data['count'], data['count_exact']), (30, False))
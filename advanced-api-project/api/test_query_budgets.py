@@ -0,0 +1,177 @@
+from unittest import mock
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from .models import Book, Author
+from .testing import QueryBudgetTestMixin, get_query_budget
+from .urls import urlpatterns
+from .views import AuthorDetail
+
+class QueryBudgetTests(QueryBudgetTestMixin, APITestCase):
+    """
+    Ensure every endpoint stays within its declared query budget at 1, 10
+    and 100 rows, so N+1 regressions fail here rather than in production.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='testuser', password='testpassword')
+
+    def seed_author(self, books, name='Budget Author'):
+        author = Author.objects.create(name=name)
+        Book.objects.bulk_create(
+            Book(title='Budget %d' % i, author=author, publication_year=1950 + i % 50) for i in range(books)
+        )
+        return author
+
+    def seed_authors(self, count, books=3):
+        authors = Author.objects.bulk_create(Author(name='Budget Author %d' % i) for i in range(count))
+        Book.objects.bulk_create(
+            Book(title='Budget %d-%d' % (i, j), author=author, publication_year=2000)
+            for i, author in enumerate(authors) for j in range(books)
+        )
+        return authors
+
+    def test_every_view_declares_a_budget(self):
+        """
+        Ensure new views cannot be added without a query budget.
+        """
+        for pattern in urlpatterns:
+            view_class = pattern.callback.view_class
+            methods = [method.upper() for method in view_class.http_method_names if hasattr(view_class, method)]
+            for method in methods:
+                if method in ('OPTIONS', 'HEAD'):
+                    continue
+                self.assertIsNotNone(get_query_budget(view_class, method), '%s %s' % (view_class.__name__, method))
+
+    def test_book_list(self):
+        """
+        Ensure the book list, its search, expansion and export stay within budget.
+        """
+        for query in ('', '?search=budget', '?expand=author', '?format=ndjson', '?ordering=-publication_year'):
+            with self.subTest(query=query):
+                def build(size):
+                    self.seed_authors(size, books=1)
+                    return reverse('book-list') + query, None
+                self.assertQueryBudget('GET', build)
+
+    def test_book_detail(self):
+        """
+        Ensure the book detail stays within budget.
+        """
+        def build(size):
+            author = self.seed_author(size)
+            return reverse('book-detail', args=[author.books.first().id]) + '?expand=author', None
+        self.assertQueryBudget('GET', build)
+
+    def test_author_list(self):
+        """
+        Ensure the author list and its nested books stay within budget.
+        """
+        for query in ('', '?format=csv'):
+            with self.subTest(query=query):
+                self.assertQueryBudget('GET', lambda size: (self.seed_authors(size) and reverse('author-list') + query, None))
+
+    def test_author_detail(self):
+        """
+        Ensure the author detail stays within budget however many books it embeds.
+        """
+        def build(size):
+            return reverse('author-detail', args=[self.seed_author(size).id]), None
+        self.assertQueryBudget('GET', build)
+
+    def test_book_create(self):
+        """
+        Ensure creating a book stays within budget.
+        """
+        def build(size):
+            author = self.seed_author(size)
+            return reverse('book-create'), {'title': 'New', 'author': author.id, 'publication_year': 2001}
+        self.assertQueryBudget('POST', build, user=self.user)
+
+    def test_book_update(self):
+        """
+        Ensure updating (and moving) a book stays within budget.
+        """
+        def build(size):
+            author = self.seed_author(size)
+            other = Author.objects.create(name='Other Author')
+            book = author.books.first()
+            return reverse('book-update', args=[book.id]), {'title': 'Moved', 'author': other.id}
+        self.assertQueryBudget('PATCH', build, user=self.user)
+
+    def test_book_delete(self):
+        """
+        Ensure deleting a book stays within budget.
+        """
+        def build(size):
+            return reverse('book-delete', args=[self.seed_author(size).books.first().id]), None
+        self.assertQueryBudget('DELETE', build, user=self.user)
+
+    def test_book_batch(self):
+        """
+        Ensure batch writes run a constant number of queries for any batch size.
+        """
+        def build(size):
+            author = self.seed_author(size)
+            rows = [{'id': book.id, 'title': 'Batched %d' % book.id} for book in author.books.all()]
+            rows += [{'title': 'Created %d' % i, 'author': author.id, 'publication_year': 2001} for i in range(size)]
+            return reverse('book-batch'), rows
+        self.assertQueryBudget('POST', build, user=self.user)
+
+    def test_author_writes(self):
+        """
+        Ensure author create, update and delete stay within budget; deleting cascades to every book.
+        """
+        self.assertQueryBudget('POST', lambda size: (reverse('author-list'), {'name': 'New Author'}), user=self.user)
+
+        def build(size):
+            return reverse('author-detail', args=[self.seed_author(size).id]), {'name': 'Renamed'}
+        self.assertQueryBudget('PATCH', build, user=self.user)
+
+        def build(size):
+            return reverse('author-detail', args=[self.seed_author(size).id]), None
+        self.assertQueryBudget('DELETE', build, user=self.user)
+
+    def test_book_bulk_delete(self):
+        """
+        Ensure a filtered bulk delete runs a constant number of queries per chunk.
+        """
+        def build(size):
+            return reverse('book-bulk-delete') + '?author=%d' % self.seed_author(size).id, None
+        self.assertQueryBudget('DELETE', build, user=self.user)
+
+    def test_multi_get(self):
+        """
+        Ensure fetching books and authors by id stays within budget however many ids are sent.
+        """
+        def build(size):
+            return reverse('book-lookup'), {'ids': list(self.seed_author(size).books.values_list('id', flat=True))}
+        self.assertQueryBudget('POST', build)
+
+        def build(size):
+            return reverse('author-lookup'), {'ids': [author.id for author in self.seed_authors(size)]}
+        self.assertQueryBudget('POST', build)
+
+    def test_change_feed(self):
+        """
+        Ensure reading the change feed stays within budget however many changes are waiting.
+        """
+        def build(size):
+            for i in range(size):
+                Author.objects.create(name='Changed Author %d' % i)
+            return reverse('change-feed') + '?since=0', None
+        self.assertQueryBudget('GET', build)
+
+    def test_exceeding_the_budget_lists_queries(self):
+        """
+        Ensure a budget failure names the view and lists the queries it ran.
+        """
+        def build(size):
+            return reverse('author-detail', args=[self.seed_author(size).id]), None
+        with mock.patch.object(AuthorDetail, 'query_budget', {'GET': 1}):
+            with self.assertRaises(AssertionError) as failure:
+                self.assertQueryBudget('GET', build, sizes=(1,))
+        message = str(failure.exception)
+        self.assertIn('AuthorDetail allows 1', message)
+        self.assertIn('1. SELECT', message)
+        self.assertIn('2. SELECT', message)
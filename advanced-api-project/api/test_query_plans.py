@@ -0,0 +1,15 @@
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+
+class QueryPlanAuditTests(TestCase):
+    """
+    Tests for the audit_query_plans management command.
+    """
+    def test_no_book_list_query_scans_the_table(self):
+        """
+        Ensure every filter/search/ordering combination of the book list uses an index.
+        """
+        out = StringIO()
+        call_command('audit_query_plans', stdout=out)
+        self.assertIn('0 of 160 query plans flagged', out.getvalue())
@@ -0,0 +1,56 @@
+import json
+from unittest import skipIf
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from .models import Book, Author
+from .renderers import msgpack
+
+class RendererTests(APITestCase):
+    """
+    Tests for the columnar JSON and MessagePack renderers.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = Author.objects.create(name='Render Author')
+        cls.book1 = Book.objects.create(title='First', author=cls.author, publication_year=2001)
+        cls.book2 = Book.objects.create(title='Second', author=cls.author, publication_year=2002)
+
+    def test_columnar_book_list(self):
+        """
+        Ensure the columnar renderer lays paginated results out by field.
+        """
+        response = self.client.get(reverse('book-list'), HTTP_ACCEPT='application/vnd.columnar+json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/vnd.columnar+json')
+        body = json.loads(response.content)
+        self.assertEqual(body['results'], {
+            'id': [self.book1.id, self.book2.id],
+            'title': ['First', 'Second'],
+            'publication_year': [2001, 2002],
+            'author': [self.author.id, self.author.id],
+        })
+        self.assertEqual(body['count'], 2)
+
+    def test_columnar_leaves_objects_alone(self):
+        """
+        Ensure single objects and unpaginated nested lists keep their shape.
+        """
+        response = self.client.get(reverse('book-detail', args=[self.book1.id]) + '?format=columnar')
+        self.assertEqual(json.loads(response.content)['title'], 'First')
+        response = self.client.get(reverse('author-list') + '?format=columnar')
+        body = json.loads(response.content)
+        self.assertEqual(body['name'], ['Render Author'])
+        self.assertEqual(body['books'][0][0]['title'], 'Second')
+
+    @skipIf(msgpack is None, 'msgpack is not installed')
+    def test_msgpack_matches_json(self):
+        """
+        Ensure MessagePack responses decode to the same data as JSON.
+        """
+        for url in (reverse('book-list'), reverse('author-detail', args=[self.author.id])):
+            expected = self.client.get(url, format='json').json()
+            response = self.client.get(url, HTTP_ACCEPT='application/msgpack')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response['Content-Type'], 'application/msgpack')
+            self.assertEqual(msgpack.unpackb(response.content), expected)
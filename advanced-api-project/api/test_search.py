@@ -0,0 +1,118 @@
+from io import StringIO
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from .models import Book, Author
+from .search import SEARCH_TABLE
+
+class BookSearchTests(APITestCase):
+    """
+    Tests for the FTS5-backed search on the book list endpoint.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='testuser', password='testpassword')
+        cls.tolkien = Author.objects.create(name='J. R. R. Tolkien')
+        cls.writer = Author.objects.create(name='Dragon Writer')
+        cls.hobbit = Book.objects.create(title='The Hobbit', author=cls.tolkien, publication_year=1937)
+        cls.rings = Book.objects.create(title='The Lord of the Rings', author=cls.tolkien, publication_year=1954)
+        cls.dragons = Book.objects.create(title='Dragons and Dungeons', author=cls.writer, publication_year=1990)
+        cls.notes = Book.objects.create(title='Field Notes', author=cls.writer, publication_year=1991)
+
+    def search(self, query, extra=''):
+        response = self.client.get(reverse('book-list') + '?search=' + query + extra, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [row['title'] for row in response.data['results']]
+
+    def test_search_title(self):
+        """
+        Ensure title words match as prefixes.
+        """
+        self.assertEqual(self.search('hobb'), ['The Hobbit'])
+
+    def test_search_author_name(self):
+        """
+        Ensure the author name is searchable.
+        """
+        self.assertEqual(self.search('tolkien'), ['The Hobbit', 'The Lord of the Rings'])
+
+    def test_all_terms_must_match(self):
+        """
+        Ensure every term must match, like SearchFilter.
+        """
+        self.assertEqual(self.search('tolkien rings'), ['The Lord of the Rings'])
+
+    def test_results_ranked_by_relevance(self):
+        """
+        Ensure title matches rank ahead of author-name matches.
+        """
+        self.assertEqual(self.search('dragon'), ['Dragons and Dungeons', 'Field Notes'])
+
+    def test_explicit_ordering_overrides_rank(self):
+        """
+        Ensure ?ordering= takes precedence over relevance.
+        """
+        self.assertEqual(self.search('dragon', '&ordering=title'), ['Dragons and Dungeons', 'Field Notes'])
+        self.assertEqual(self.search('dragon', '&ordering=-publication_year'), ['Field Notes', 'Dragons and Dungeons'])
+
+    def test_ranked_results_paginate(self):
+        """
+        Ensure relevance-ordered results can be paged through.
+        """
+        first = self.client.get(reverse('book-list') + '?search=dragon&page_size=1', format='json')
+        second = self.client.get(first.data['next'], format='json')
+        self.assertEqual(first.data['results'][0]['title'], 'Dragons and Dungeons')
+        self.assertEqual(second.data['results'][0]['title'], 'Field Notes')
+        self.assertIsNone(second.data['next'])
+
+    def test_punctuation_is_harmless(self):
+        """
+        Ensure FTS syntax characters in the query do not cause errors.
+        """
+        self.assertEqual(self.search('"hobbit'), ['The Hobbit'])
+        self.assertEqual(self.search('*'), [])
+
+    def test_index_follows_saves_and_deletes(self):
+        """
+        Ensure the index is kept in sync when books and authors change.
+        """
+        self.hobbit.title = 'There and Back Again'
+        self.hobbit.save()
+        self.assertEqual(self.search('hobbit'), [])
+        self.assertEqual(self.search('back'), ['There and Back Again'])
+
+        self.tolkien.name = 'John Ronald Reuel'
+        self.tolkien.save()
+        self.assertEqual(self.search('tolkien'), [])
+        self.assertEqual(len(self.search('reuel')), 2)
+
+        self.rings.delete()
+        self.assertEqual(self.search('reuel'), ['There and Back Again'])
+
+    def test_batch_writes_are_indexed(self):
+        """
+        Ensure rows written by the batch endpoint are searchable.
+        """
+        self.client.login(username='testuser', password='testpassword')
+        data = [
+            {'title': 'Silmarillion', 'author': self.tolkien.id, 'publication_year': 1977},
+            {'id': self.notes.id, 'title': 'Field Guide'},
+        ]
+        self.client.post(reverse('book-batch'), data, format='json')
+        self.assertEqual(self.search('silmar'), ['Silmarillion'])
+        self.assertEqual(self.search('guide'), ['Field Guide'])
+
+    def test_rebuild_command(self):
+        """
+        Ensure the management command rebuilds a wiped index.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM %s' % SEARCH_TABLE)
+        self.assertEqual(self.search('hobbit'), [])
+        out = StringIO()
+        call_command('rebuild_book_search', stdout=out)
+        self.assertIn('Indexed 4 books', out.getvalue())
+        self.assertEqual(self.search('hobbit'), ['The Hobbit'])
@@ -0,0 +1,101 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from .models import Book, Author
+
+class DirtyFieldTrackingTests(APITestCase):
+    """
+    Tests for saving only changed columns on Book and Author.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='testuser', password='testpassword')
+        cls.author = Author.objects.create(name='Tracked Author')
+        cls.book = Book.objects.create(title='Tracked', author=cls.author, publication_year=2000)
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def writes(self, queries):
+        return [query['sql'] for query in queries.captured_queries if query['sql'].startswith('UPDATE "api_book"')]
+
+    def test_save_writes_only_changed_columns(self):
+        """
+        Ensure a save updates only the changed column and the updated_at stamp.
+        """
+        book = Book.objects.get(pk=self.book.pk)
+        book.publication_year = 2001
+        self.assertEqual(book.get_dirty_fields(), ['publication_year'])
+        with CaptureQueriesContext(connection) as queries:
+            book.save()
+        [update] = self.writes(queries)
+        self.assertIn('"publication_year"', update)
+        self.assertIn('"updated_at"', update)
+        self.assertNotIn('"title"', update)
+        self.assertEqual(book.get_dirty_fields(), [])
+
+    def test_unchanged_save_is_skipped(self):
+        """
+        Ensure saving an unchanged instance runs no queries at all.
+        """
+        book = Book.objects.get(pk=self.book.pk)
+        book.title = 'Tracked'
+        with self.assertNumQueries(0):
+            book.save()
+
+    def test_refresh_from_db_resets_loaded_values(self):
+        """
+        Ensure a value changed back after refresh_from_db() is still written.
+        """
+        book = Book.objects.get(pk=self.book.pk)
+        Book.objects.filter(pk=self.book.pk).update(title='Elsewhere')
+        book.refresh_from_db()
+        book.title = 'Tracked'
+        book.save()
+        self.assertEqual(Book.objects.get(pk=self.book.pk).title, 'Tracked')
+
+        Book.objects.filter(pk=self.book.pk).update(title='Elsewhere', publication_year=1990)
+        book.refresh_from_db(fields=['title'])
+        book.title = 'Tracked'
+        self.assertEqual(book.get_dirty_fields(), ['title'])
+
+    def test_noop_patch_skips_the_write(self):
+        """
+        Ensure a PATCH that changes nothing leaves the row and its version alone.
+        """
+        url = reverse('author-detail', args=[self.author.id])
+        etag = self.client.get(url, format='json')['ETag']
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(url, {'name': 'Tracked Author'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse([query for query in queries.captured_queries if query['sql'].startswith('UPDATE')])
+        self.assertEqual(self.client.get(url, format='json')['ETag'], etag)
+
+    def test_patch_writes_only_the_patched_field(self):
+        """
+        Ensure a one-field PATCH on a book writes that field only.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(
+                reverse('book-update', args=[self.book.id]), {'publication_year': 1999}, format='json',
+            )
+        self.assertEqual(response.data['publication_year'], 1999)
+        [update] = self.writes(queries)
+        self.assertNotIn('"title"', update)
+        # The search index only covers title and author name.
+        self.assertFalse([query for query in queries.captured_queries if 'api_book_search' in query['sql']])
+
+    def test_moving_a_book_touches_both_authors(self):
+        """
+        Ensure the previous author is still found after a tracked save.
+        """
+        other = Author.objects.create(name='Other Author')
+        book = Book.objects.get(pk=self.book.pk)
+        book.author = other
+        with CaptureQueriesContext(connection) as queries:
+            book.save()
+        [touch] = [query['sql'] for query in queries.captured_queries if query['sql'].startswith('UPDATE "api_author"')]
+        self.assertIn('IN (%d, %d)' % tuple(sorted([self.author.id, other.id])), touch)
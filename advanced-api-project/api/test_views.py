@@ -27,7 +27,7 @@ class BookAPITests(APITestCase):
         url = reverse('book-list')
         response = self.client.get(url, format='json')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data['results']), 2)
 
     def test_retrieve_book_unauthenticated(self):
         """
@@ -87,8 +87,8 @@ class BookAPITests(APITestCase):
         url = reverse('book-list') + '?publication_year=2022'
         response = self.client.get(url, format='json')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['title'], 'Book A')
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['title'], 'Book A')
 
     def test_search_books_by_title(self):
         """
@@ -97,8 +97,8 @@ class BookAPITests(APITestCase):
         url = reverse('book-list') + '?search=Book A'
         response = self.client.get(url, format='json')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['title'], 'Book A')
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['title'], 'Book A')
 
     def test_order_books_by_title(self):
         """
@@ -107,4 +107,4 @@ class BookAPITests(APITestCase):
         url = reverse('book-list') + '?ordering=-title' # Descending order
         response = self.client.get(url, format='json')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data[0]['title'], 'Book B')
+        self.assertEqual(response.data['results'][0]['title'], 'Book B')
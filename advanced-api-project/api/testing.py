@@ -0,0 +1,95 @@
+"""
+Test helpers for enforcing the per-view query budgets.
+
+Views declare ``query_budget``: either the maximum number of SQL queries
+one request may run, or a dict of such limits keyed by HTTP method.
+Authentication queries are not counted; tests authenticate with
+``force_authenticate``.
+"""
+import re
+from collections import Counter
+
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+from rest_framework.test import APIClient
+
+BUDGET_SIZES = (1, 10, 100)
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+
+def get_query_budget(view_class, method):
+    """
+    The budget ``view_class`` declares for ``method``, or None if it declares none.
+    """
+    budget = getattr(view_class, 'query_budget', None)
+    if isinstance(budget, dict):
+        return budget.get(method.upper())
+    return budget
+
+
+def normalize_sql(sql):
+    """
+    Replace literals so the same statement run for different rows compares equal.
+    """
+    return _LITERALS.sub('?', sql)
+
+
+class QueryBudgetTestMixin:
+    """
+    TestCase mixin adding ``assertQueryBudget``.
+    """
+    budget_sizes = BUDGET_SIZES
+
+    def assertQueryBudget(self, method, build, user=None, sizes=None):
+        """
+        Run one request per dataset size and check each against the view's
+        declared budget, and that the query count does not grow with size.
+
+        ``build(size)`` seeds ``size`` rows and returns ``(url, data)``. Each
+        size runs in a savepoint that is rolled back afterwards.
+        """
+        counts = {}
+        for size in sizes or self.budget_sizes:
+            with transaction.atomic():
+                url, data = build(size)
+                view_class = resolve(url.split('?')[0]).func.view_class
+                budget = get_query_budget(view_class, method)
+                self.assertIsNotNone(budget, '%s declares no query budget for %s.' % (view_class.__name__, method))
+
+                client = APIClient()
+                if user is not None:
+                    client.force_authenticate(user)
+                with CaptureQueriesContext(connection) as queries:
+                    response = getattr(client, method.lower())(url, data, format='json')
+                    if response.streaming:
+                        # Streamed bodies only query the database as they are read.
+                        b''.join(response.streaming_content)
+                transaction.set_rollback(True)
+
+            self.assertLess(response.status_code, 400, '%s %s returned %d.' % (method, url, response.status_code))
+            captured = [query['sql'] for query in queries.captured_queries]
+            counts[size] = len(captured)
+            if len(captured) > budget:
+                self.fail(self.budget_message(
+                    '%s %s ran %d queries with %d rows; %s allows %d.'
+                    % (method, url, len(captured), size, view_class.__name__, budget),
+                    captured,
+                ))
+            if len(set(counts.values())) > 1:
+                self.fail(self.budget_message(
+                    '%s %s query count grows with the dataset: %s.' % (
+                        method, url, ', '.join('%d rows: %d' % item for item in sorted(counts.items())),
+                    ),
+                    captured,
+                ))
+        return counts
+
+    def budget_message(self, summary, captured):
+        repeated = Counter(normalize_sql(sql) for sql in captured)
+        lines = [summary, 'Queries:']
+        for i, sql in enumerate(captured, 1):
+            marker = '  (repeated %dx)' % repeated[normalize_sql(sql)] if repeated[normalize_sql(sql)] > 1 else ''
+            lines.append('  %d. %s%s' % (i, sql, marker))
+        return '\n'.join(lines)
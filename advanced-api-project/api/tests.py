@@ -23,7 +23,7 @@ class BookAPITests(APITestCase):
         url = reverse('book-list')
         response = self.client.get(url, format='json')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data['results']), 1)
 
     def test_create_book_authenticated(self):
         """
@@ -84,8 +84,8 @@ class BookAPITests(APITestCase):
         url = reverse('book-list') + '?publication_year=2022'
         response = self.client.get(url, format='json')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['title'], 'Test Book')
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['title'], 'Test Book')
 
     def test_search_books(self):
         """
@@ -95,8 +95,8 @@ class BookAPITests(APITestCase):
         url = reverse('book-list') + '?search=Test'
         response = self.client.get(url, format='json')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['title'], 'Test Book')
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['title'], 'Test Book')
 
     def test_order_books(self):
         """
@@ -106,4 +106,4 @@ class BookAPITests(APITestCase):
         url = reverse('book-list') + '?ordering=title'
         response = self.client.get(url, format='json')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data[0]['title'], 'A New Book')
+        self.assertEqual(response.data['results'][0]['title'], 'A New Book')
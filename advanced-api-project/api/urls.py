@@ -5,8 +5,22 @@ from .views import (
     BookCreateView, 
     BookUpdateView, 
     BookDeleteView, 
+    BookBatchView,
+    BookBulkDeleteView,
+    BookLookupView,
     AuthorList, 
-    AuthorDetail
+    AuthorDetail,
+    AuthorLookupView,
+    ChangeFeedView,
+)
+from .async_views import (
+    AsyncBookListView,
+    AsyncBookDetailView,
+    AsyncBookCreateView,
+    AsyncBookUpdateView,
+    AsyncBookDeleteView,
+    AsyncAuthorList,
+    AsyncAuthorDetail,
 )
 
 urlpatterns = [
@@ -16,8 +30,24 @@ urlpatterns = [
     path('books/<int:pk>/', BookDetailView.as_view(), name='book-detail'),
     path('books/update/<int:pk>/', BookUpdateView.as_view(), name='book-update'),
     path('books/delete/<int:pk>/', BookDeleteView.as_view(), name='book-delete'),
+    path('books/batch/', BookBatchView.as_view(), name='book-batch'),
+    path('books/bulk-delete/', BookBulkDeleteView.as_view(), name='book-bulk-delete'),
+    path('books/lookup/', BookLookupView.as_view(), name='book-lookup'),
 
     # Author URLs
     path('authors/', AuthorList.as_view(), name='author-list'),
     path('authors/<int:pk>/', AuthorDetail.as_view(), name='author-detail'),
+    path('authors/lookup/', AuthorLookupView.as_view(), name='author-lookup'),
+
+    # Change feed for incremental sync
+    path('changes/', ChangeFeedView.as_view(), name='change-feed'),
+
+    # Async variants of the above, for ASGI deployments
+    path('async/books/', AsyncBookListView.as_view(), name='async-book-list'),
+    path('async/books/create/', AsyncBookCreateView.as_view(), name='async-book-create'),
+    path('async/books/<int:pk>/', AsyncBookDetailView.as_view(), name='async-book-detail'),
+    path('async/books/update/<int:pk>/', AsyncBookUpdateView.as_view(), name='async-book-update'),
+    path('async/books/delete/<int:pk>/', AsyncBookDeleteView.as_view(), name='async-book-delete'),
+    path('async/authors/', AsyncAuthorList.as_view(), name='async-author-list'),
+    path('async/authors/<int:pk>/', AsyncAuthorDetail.as_view(), name='async-author-detail'),
 ]
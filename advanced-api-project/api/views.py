@@ -1,31 +1,62 @@
-from rest_framework import generics, filters
-from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated
+from django.core.validators import EMPTY_VALUES
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import generics, filters, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import AllowAny, IsAuthenticatedOrReadOnly, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from django_filters import rest_framework
-from .models import Book, Author
-from .serializers import BookSerializer, AuthorSerializer
+from django_filters.utils import translate_validation
+from .models import Book, Author, Change
+from .serializers import BookSerializer, AuthorSerializer, BookBatchRowSerializer, ChangeSerializer, parse_pk
+from .pagination import BookCursorPagination
+from .mixins import (
+    QuerySetOptimizerMixin, StreamingExportMixin, ConditionalRetrieveMixin, CachedListMixin, FastListMixin,
+    MultiGetMixin,
+)
+from .cache import invalidate_book_lists
+from .changes import head, record_changes, trim_changes
+from .renderers import API_RENDERER_CLASSES, NDJSONRenderer, StreamingRenderer
+from .search import BookSearchFilter, index_books, unindex_books
 
 # Generic views for the Book model
-class BookListView(generics.ListAPIView):
+class BookListView(MultiGetMixin, StreamingExportMixin, CachedListMixin, FastListMixin, QuerySetOptimizerMixin,
+                   generics.ListAPIView):
     """
     A ListView for retrieving all books.
     Allows read-only access to unauthenticated users.
+    Results are cursor-paginated on the active ordering (see BookCursorPagination);
+    the first page reports a total capped at 10,000, or exact with ?count=exact.
+    ?format=ndjson or ?format=csv streams the full filtered result instead.
+    ?search= uses the FTS5 index and ranks results by relevance.
+    JSON responses are cached until the next Book/Author write (see CachedListMixin).
+    Plain (unexpanded) reads are serialized from .values() rows (see FastListMixin).
+    ?ids=1,2,3 fetches those books instead, in that order (see MultiGetMixin).
     """
     queryset = Book.objects.all()
     serializer_class = BookSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
-    filter_backends = [rest_framework.DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    pagination_class = BookCursorPagination
+    filter_backends = [rest_framework.DjangoFilterBackend, BookSearchFilter, filters.OrderingFilter]
     filterset_fields = ['title', 'author', 'publication_year']
     search_fields = ['title', 'author__name']
     ordering_fields = ['title', 'publication_year']
+    # The page itself plus the capped count on the first page.
+    query_budget = 2
 
-class BookDetailView(generics.RetrieveAPIView):
+class BookDetailView(ConditionalRetrieveMixin, QuerySetOptimizerMixin, generics.RetrieveAPIView):
     """
     A DetailView for retrieving a single book by ID.
     Allows read-only access to unauthenticated users.
+    Supports conditional GETs (ETag / Last-Modified).
     """
     queryset = Book.objects.all()
     serializer_class = BookSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    renderer_classes = API_RENDERER_CLASSES
+    query_budget = 1
 
 class BookCreateView(generics.CreateAPIView):
     """
@@ -35,8 +66,10 @@ class BookCreateView(generics.CreateAPIView):
     queryset = Book.objects.all()
     serializer_class = BookSerializer
     permission_classes = [IsAuthenticated]
+    renderer_classes = API_RENDERER_CLASSES
+    query_budget = 7
 
-class BookUpdateView(generics.UpdateAPIView):
+class BookUpdateView(QuerySetOptimizerMixin, generics.UpdateAPIView):
     """
     An UpdateView for modifying an existing book.
     Restricted to authenticated users.
@@ -44,8 +77,10 @@ class BookUpdateView(generics.UpdateAPIView):
     queryset = Book.objects.all()
     serializer_class = BookSerializer
     permission_classes = [IsAuthenticated]
+    renderer_classes = API_RENDERER_CLASSES
+    query_budget = {'PUT': 8, 'PATCH': 8}
 
-class BookDeleteView(generics.DestroyAPIView):
+class BookDeleteView(QuerySetOptimizerMixin, generics.DestroyAPIView):
     """
     A DeleteView for removing a book.
     Restricted to authenticated users.
@@ -53,20 +88,345 @@ class BookDeleteView(generics.DestroyAPIView):
     queryset = Book.objects.all()
     serializer_class = BookSerializer
     permission_classes = [IsAuthenticated]
+    renderer_classes = API_RENDERER_CLASSES
+    query_budget = 6
+
+class BookBatchView(generics.GenericAPIView):
+    """
+    Create and update many books in one request.
+    Restricted to authenticated users.
+
+    The body is a list of book objects: rows with an "id" update that book
+    (partially), rows without one create a new book. All referenced authors
+    and books are loaded in two queries, rows are validated without further
+    lookups, and the valid rows are written with bulk_create/bulk_update in
+    a single transaction. The response reports a status for every row.
+    """
+    queryset = Book.objects.all()
+    serializer_class = BookBatchRowSerializer
+    permission_classes = [IsAuthenticated]
+    renderer_classes = API_RENDERER_CLASSES
+    query_budget = 13
+    max_batch_size = 5000
+    write_batch_size = 500
+
+    def post(self, request, *args, **kwargs):
+        rows = request.data
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            raise ValidationError({'detail': 'Expected a list of book objects.'})
+        if len(rows) > self.max_batch_size:
+            raise ValidationError({'detail': 'At most %d books per batch.' % self.max_batch_size})
+
+        authors = Author.objects.in_bulk(self.collect_ids(rows, 'author', Author))
+        books = self.get_queryset().in_bulk(self.collect_ids(rows, 'id', Book))
+        context = dict(self.get_serializer_context(), authors=authors)
+
+        results = []
+        to_create, to_update, update_fields, seen = [], [], set(), set()
+        touched_authors = set()
+        now = timezone.now()
+        for index, row in enumerate(rows):
+            book_id = row.get('id')
+            if book_id is None:
+                instance = None
+            else:
+                pk = parse_pk(book_id, Book)
+                instance = books.get(pk)
+                if instance is None or instance.pk in seen:
+                    if pk is None:
+                        reason = 'Invalid id: %r.' % (book_id,)
+                    else:
+                        reason = 'Duplicate id in batch.' if instance is not None else 'Book not found.'
+                    results.append({'index': index, 'status': 'invalid', 'errors': {'id': [reason]}})
+                    continue
+                seen.add(instance.pk)
+
+            serializer = self.get_serializer_class()(
+                instance, data=row, partial=instance is not None, context=context,
+            )
+            if not serializer.is_valid():
+                results.append({'index': index, 'status': 'invalid', 'errors': serializer.errors})
+                continue
+
+            if instance is None:
+                to_create.append((index, Book(**serializer.validated_data)))
+                touched_authors.add(serializer.validated_data['author'].pk)
+            else:
+                touched_authors.add(instance.author_id)
+                for attr, value in serializer.validated_data.items():
+                    setattr(instance, attr, value)
+                touched_authors.add(instance.author_id)
+                # bulk_update() does not run auto_now.
+                instance.updated_at = now
+                update_fields.update(serializer.validated_data)
+                to_update.append((index, instance))
+
+        with transaction.atomic():
+            Book.objects.bulk_create([book for _, book in to_create], batch_size=self.write_batch_size)
+            if to_update and update_fields:
+                Book.objects.bulk_update(
+                    [book for _, book in to_update], sorted(update_fields | {'updated_at'}),
+                    batch_size=self.write_batch_size,
+                )
+            # Bulk writes skip the post_save signals, so index the rows, record
+            # them in the change log, bump the authors' versions and invalidate
+            # cached lists here.
+            index_books([book.pk for _, book in to_create + to_update])
+            record_changes(Book, [book.pk for _, book in to_create], Change.CREATED)
+            record_changes(Book, [book.pk for _, book in to_update], Change.UPDATED)
+            Author.objects.filter(pk__in=touched_authors).touch()
+            invalidate_book_lists()
+
+        results.extend({'index': index, 'status': 'created', 'id': book.pk} for index, book in to_create)
+        results.extend({'index': index, 'status': 'updated', 'id': book.pk} for index, book in to_update)
+        results.sort(key=lambda result: result['index'])
+
+        failed = len(rows) - len(to_create) - len(to_update)
+        if not failed:
+            response_status = status.HTTP_200_OK
+        elif failed == len(rows):
+            response_status = status.HTTP_400_BAD_REQUEST
+        else:
+            response_status = status.HTTP_207_MULTI_STATUS
+        return Response({
+            'created': len(to_create),
+            'updated': len(to_update),
+            'failed': failed,
+            'results': results,
+        }, status=response_status)
+
+    def collect_ids(self, rows, key, model):
+        ids = (parse_pk(row.get(key), model) for row in rows)
+        return {pk for pk in ids if pk is not None}
+
+class BookLookupView(MultiGetMixin, FastListMixin, QuerySetOptimizerMixin, generics.GenericAPIView):
+    """
+    POST {"ids": [...]} variant of ?ids= on the book list, for long id lists.
+    It only reads, so it is open like the list.
+    """
+    queryset = Book.objects.all()
+    serializer_class = BookSerializer
+    permission_classes = [AllowAny]
+    renderer_classes = API_RENDERER_CLASSES
+    query_budget = 1
+
+    def post(self, request, *args, **kwargs):
+        return self.lookup(request, *args, **kwargs)
+
+class BookBulkDeleteView(generics.GenericAPIView):
+    """
+    Delete every book matching BookListView's filters (?title=, ?author=,
+    ?publication_year=, ?search=). Restricted to authenticated users, and
+    at least one filter is required.
+
+    Matching ids are deleted in chunks of ``chunk_size``, each in its own
+    short transaction, so the database is never locked for long and no
+    model instances are loaded. What Book's post_delete receivers would do
+    per row (search index, change log, author versions, cached lists) is
+    done once per chunk. The response reports the number deleted; with
+    ?format=ndjson a progress line is streamed after every chunk instead,
+    ending with the total. A failure stops the delete; earlier chunks stay
+    deleted.
+    """
+    queryset = Book.objects.all()
+    serializer_class = BookSerializer
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [*API_RENDERER_CLASSES, NDJSONRenderer]
+    filterset_fields = BookListView.filterset_fields
+    search_fields = BookListView.search_fields
+    # The author filter's lookup, then per chunk: the ids, the delete, the
+    # index, the change log (2) and the authors, inside a savepoint when nested.
+    query_budget = 9
+    chunk_size = 500
+
+    def delete(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        if not self.filtered:
+            filter_params = {*self.filterset_fields, api_settings.SEARCH_PARAM}
+            raise ValidationError({'detail': 'At least one filter is required: %s.' % ', '.join(sorted(filter_params))})
+        chunks = self.delete_chunks(queryset)
+
+        renderer = request.accepted_renderer
+        if not isinstance(renderer, StreamingRenderer):
+            return Response({'deleted': sum(chunks)})
+        return StreamingHttpResponse(
+            renderer.stream(self.progress(chunks), ['deleted', 'done']),
+            content_type='%s; charset=%s' % (renderer.media_type, renderer.charset),
+        )
+
+    def filter_queryset(self, queryset):
+        """
+        Apply the list filters and note in ``filtered`` whether any of them
+        narrows the delete. The backends ignore blank values (?title=), so
+        this looks at what they parsed, not at which parameters were sent.
+        """
+        filterset = rest_framework.DjangoFilterBackend().get_filterset(self.request, queryset, self)
+        if not filterset.is_valid():
+            raise translate_validation(filterset.errors)
+        search = BookSearchFilter()
+        self.filtered = bool(search.get_search_terms(self.request)) or any(
+            value not in EMPTY_VALUES for value in filterset.form.cleaned_data.values()
+        )
+        return search.filter_queryset(self.request, filterset.qs, self)
+
+    def progress(self, chunks):
+        deleted = 0
+        for count in chunks:
+            deleted += count
+            yield {'deleted': deleted, 'done': False}
+        yield {'deleted': deleted, 'done': True}
+
+    def delete_chunks(self, queryset):
+        """
+        Delete the matching books chunk by chunk, yielding each chunk's size.
+        """
+        queryset = queryset.order_by('pk').values_list('pk', 'author_id')
+        last_pk = 0
+        while True:
+            with transaction.atomic():
+                rows = list(queryset.filter(pk__gt=last_pk)[:self.chunk_size])
+                if not rows:
+                    return
+                ids = [pk for pk, _ in rows]
+                raw_delete_books(Book.objects.filter(pk__in=ids))
+                unindex_books(ids)
+                record_changes(Book, ids, Change.DELETED)
+                Author.objects.filter(pk__in={author_id for _, author_id in rows}).touch()
+            invalidate_book_lists()
+            yield len(ids)
+            if len(ids) < self.chunk_size:
+                return
+            last_pk = ids[-1]
 
 # Combined generic views for the Author model
-class AuthorList(generics.ListCreateAPIView):
+class AuthorList(MultiGetMixin, StreamingExportMixin, QuerySetOptimizerMixin, generics.ListCreateAPIView):
     """
     API view to retrieve a list of authors or create a new author.
+    Nested books are prefetched in a single query by QuerySetOptimizerMixin.
+    ?format=ndjson or ?format=csv streams the full list instead.
+    ?ids=1,2,3 fetches those authors instead, in that order (see MultiGetMixin).
     """
     queryset = Author.objects.all()
     serializer_class = AuthorSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    query_budget = {'GET': 2, 'POST': 4}
 
-class AuthorDetail(generics.RetrieveUpdateDestroyAPIView):
+class AuthorDetail(ConditionalRetrieveMixin, QuerySetOptimizerMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     API view to retrieve, update, or delete an author instance.
+    Supports conditional GETs; the version also changes when any of the
+    author's books changes.
     """
     queryset = Author.objects.all()
     serializer_class = AuthorSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    renderer_classes = API_RENDERER_CLASSES
+    query_budget = {'GET': 2, 'PUT': 6, 'PATCH': 6, 'DELETE': 12}
+
+    def perform_destroy(self, instance):
+        delete_author(instance)
+
+class AuthorLookupView(MultiGetMixin, QuerySetOptimizerMixin, generics.GenericAPIView):
+    """
+    POST {"ids": [...]} variant of ?ids= on the author list, for long id lists.
+    Nested books are prefetched for all authors at once.
+    """
+    queryset = Author.objects.all()
+    serializer_class = AuthorSerializer
+    permission_classes = [AllowAny]
+    renderer_classes = API_RENDERER_CLASSES
+    query_budget = 2
+
+    def post(self, request, *args, **kwargs):
+        return self.lookup(request, *args, **kwargs)
+
+def raw_delete_books(queryset):
+    """
+    Delete the books in one DELETE statement, without loading them.
+
+    QuerySet.delete() would fetch every row to send Book's delete signals,
+    whose side effects the callers apply in bulk instead. _raw_delete() is
+    private Django API and skips cascades, so it is only safe while no model
+    references Book; refuse to run otherwise.
+    """
+    related = [rel.name for rel in Book._meta.related_objects]
+    if related:
+        raise RuntimeError('A raw delete of books would skip the cascade to: %s.' % ', '.join(related))
+    queryset._raw_delete(queryset.db)
+
+def delete_author(author):
+    """
+    Delete an author and their books.
+
+    Cascading through the ORM would send Book's post_delete receivers once
+    per book; delete the books in one statement and apply their side
+    effects in bulk instead. The author itself is gone, so there is nobody
+    left to touch.
+    """
+    with transaction.atomic():
+        books = Book.objects.filter(author=author)
+        book_ids = list(books.values_list('id', flat=True))
+        raw_delete_books(books)
+        unindex_books(book_ids)
+        record_changes(Book, book_ids, Change.DELETED)
+        author.delete()
+        invalidate_book_lists()
+
+class ChangeFeedView(generics.GenericAPIView):
+    """
+    Incremental sync feed of Book and Author changes (see api.changes).
+
+    GET ?since=<cursor> returns the changes after the cursor, oldest first,
+    with the cursor to send next and whether more are waiting. Each object
+    appears at most once, with its latest action; "created" and "updated"
+    both mean "fetch and upsert", "deleted" means "drop". Without ?since
+    only the current cursor is returned: take it before a full download,
+    then follow the feed from there. A cursor older than the trimmed
+    tombstones gets 410 Gone and the client must resync from scratch.
+
+    Cursors follow insertion order, so an entry committed after a newer one
+    has already been read is skipped; clients should keep a small overlap
+    if writes are highly concurrent.
+    """
+    queryset = Change.objects.all()
+    serializer_class = ChangeSerializer
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    renderer_classes = API_RENDERER_CLASSES
+    # Trimming (expired tombstones and the horizon), then the page.
+    query_budget = 3
+    page_size = 100
+    max_page_size = 1000
+
+    def get(self, request, *args, **kwargs):
+        since = self.get_int_param('since')
+        if since is None:
+            return Response({'cursor': head(), 'has_more': False, 'results': []})
+
+        horizon = trim_changes()
+        if since < horizon:
+            return Response(
+                {'detail': 'Cursor is older than the change log; resync from scratch.', 'cursor': horizon},
+                status=status.HTTP_410_GONE,
+            )
+
+        limit = min(self.get_int_param('limit') or self.page_size, self.max_page_size)
+        changes = list(self.get_queryset().filter(id__gt=since).order_by('id')[:limit + 1])
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        return Response({
+            'cursor': changes[-1].id if changes else since,
+            'has_more': has_more,
+            'results': self.get_serializer(changes, many=True).data,
+        })
+
+    def get_int_param(self, name):
+        value = self.request.query_params.get(name)
+        if value is None:
+            return None
+        try:
+            value = int(value)
+        except ValueError:
+            value = -1
+        if value < 0:
+            raise ValidationError({name: ['Expected a non-negative integer.']})
+        return value
@@ -0,0 +1,52 @@
+"""
+Cached post cards: the <article> every post listing renders per post.
+
+Each card is cached under a key versioned on the post's ``updated_at``,
+which the receivers in blog.models bump whenever something the card shows
+changes (the post, its comments, its tags or its author's name). A stale
+card is therefore never looked up again and simply expires. A page of
+cards is fetched with one cache multi-get; only the misses are rendered,
+and only they need their tags loaded.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import prefetch_related_objects
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+CARD_TEMPLATE = 'blog/post_card.html'
+# Stands in for the excerpt in cards whose excerpt varies per request.
+EXCERPT_MARKER = '<!-- excerpt -->'
+
+
+def card_key(post, variant):
+    stamp = post.updated_at
+    return 'blog:post-card:%s:%d:%d.%06d' % (variant, post.pk, stamp.timestamp(), stamp.microsecond)
+
+
+def attach_cards(posts, excerpts=None):
+    """
+    Set ``card`` on every post to its rendered card. ``excerpts`` maps post
+    ids to (safe) HTML shown instead of the start of the content, e.g.
+    search snippets.
+    """
+    posts = list(posts)
+    variant = 'excerpt' if excerpts is None else 'custom'
+    keys = {post.pk: card_key(post, variant) for post in posts}
+    cards = cache.get_many(list(keys.values()))
+
+    missing = [post for post in posts if keys[post.pk] not in cards]
+    if missing:
+        prefetch_related_objects(missing, 'tags')
+        rendered = {
+            keys[post.pk]: render_to_string(CARD_TEMPLATE, {'post': post, 'excerpt': excerpts is None})
+            for post in missing
+        }
+        cache.set_many(rendered, getattr(settings, 'BLOG_POST_CARD_TIMEOUT', 86400))
+        cards.update(rendered)
+
+    for post in posts:
+        card = cards[keys[post.pk]]
+        if excerpts is not None:
+            card = card.replace(EXCERPT_MARKER, excerpts.get(post.pk, ''))
+        post.card = mark_safe(card)
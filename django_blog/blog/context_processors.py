@@ -0,0 +1,46 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.functional import SimpleLazyObject
+
+from .models import TagStat
+
+# Number of font-size steps in the cloud.
+CLOUD_WEIGHTS = 5
+
+
+def build_tag_cloud():
+    """
+    Return the most used tags (BLOG_TAG_CLOUD_SIZE of them), alphabetically,
+    each with its post count and a 1..CLOUD_WEIGHTS weight.
+    """
+    size = getattr(settings, 'BLOG_TAG_CLOUD_SIZE', 30)
+    stats = list(
+        TagStat.objects.filter(post_count__gt=0).select_related('tag').order_by('-post_count', 'tag__name')[:size]
+    )
+    if not stats:
+        return []
+    low, high = stats[-1].post_count, stats[0].post_count
+    spread = max(high - low, 1)
+    cloud = [
+        {
+            'name': stat.tag.name,
+            'slug': stat.tag.slug,
+            'count': stat.post_count,
+            'weight': 1 + (stat.post_count - low) * (CLOUD_WEIGHTS - 1) // spread,
+        }
+        for stat in stats
+    ]
+    return sorted(cloud, key=lambda tag: tag['name'].lower())
+
+
+def tag_cloud(request):
+    """
+    Expose the tag cloud to every template as ``tag_cloud``. It is read
+    from the cache (cleared whenever a tag count changes), and only when a
+    template actually uses it.
+    """
+    def get_cloud():
+        return cache.get_or_set(
+            TagStat.CLOUD_CACHE_KEY, build_tag_cloud, getattr(settings, 'BLOG_TAG_CLOUD_TIMEOUT', 3600),
+        )
+    return {'tag_cloud': SimpleLazyObject(get_cloud)}
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Recount the comments and latest comment time stored on every post.'
+
+    def handle(self, *args, **options):
+        count = Post.objects.recount_comments()
+        self.stdout.write(self.style.SUCCESS('Counted comments for %d posts.' % count))
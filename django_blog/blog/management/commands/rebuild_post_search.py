@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from blog import search
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the FTS5 full-text index behind blog search.'
+
+    def handle(self, *args, **options):
+        if not search.search_available():
+            self.stdout.write('Full-text search needs SQLite with FTS5; nothing to rebuild.')
+            return
+        count = search.rebuild_index()
+        self.stdout.write(self.style.SUCCESS('Indexed %d posts.' % count))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import TagStat
+
+
+class Command(BaseCommand):
+    help = "Recount the posts per tag behind tag pages and the tag cloud from taggit's tables."
+
+    def handle(self, *args, **options):
+        TagStat.objects.rebuild()
+        self.stdout.write(self.style.SUCCESS('Counted posts for %d tags.' % TagStat.objects.count()))
@@ -1,13 +1,56 @@
+from django.core.cache import cache
 from django.db import models
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
 from django.contrib.auth.models import User
+from django.utils import timezone
 from taggit.managers import TaggableManager
+from taggit.models import Tag, TaggedItem
+from . import search
+
+class PostQuerySet(models.QuerySet):
+    def touch(self):
+        """
+        Bump updated_at without loading the rows, e.g. when the posts'
+        comments or tags changed (see blog.cards).
+        """
+        return self.update(updated_at=timezone.now())
+
+    def recount_comments(self):
+        """
+        Set comment_count and last_comment_at from the comments table, e.g.
+        for posts commented on before the counters existed (see
+        rebuild_comment_counts). updated_at is bumped too, so cached cards
+        showing the old counts are retired.
+        """
+        comments = Comment.objects.filter(post=OuterRef('pk'))
+        counts = comments.order_by().values('post').annotate(count=Count('pk')).values('count')
+        return self.update(
+            comment_count=Coalesce(Subquery(counts), 0),
+            last_comment_at=Subquery(comments.order_by('-created_at').values('created_at')[:1]),
+            updated_at=timezone.now(),
+        )
 
 class Post(models.Model):
     title = models.CharField(max_length=200)
     content = models.TextField()
     published_date = models.DateTimeField(auto_now_add=True)
+    # Also bumped when the post's comments, tags or author name change.
+    updated_at = models.DateTimeField(auto_now=True)
     author = models.ForeignKey(User, on_delete=models.CASCADE)
     tags = TaggableManager()
+    # Maintained by the Comment signals below, so pages can show activity
+    # without counting comments.
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+    last_comment_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = PostQuerySet.as_manager()
+
+    class Meta:
+        # Serves PostListView's ordering.
+        indexes = [models.Index(fields=['-published_date', '-id'], name='post_published_idx')]
 
     def __str__(self):
         return self.title
@@ -21,3 +64,135 @@ class Comment(models.Model):
 
     def __str__(self):
         return f'Comment by {self.author} on {self.post}'
+
+class TagStatQuerySet(models.QuerySet):
+    def adjust(self, tag_ids, delta):
+        """
+        Add ``delta`` to the post count of each tag, creating missing rows.
+        Counts never go below zero: tags counted before TagStat existed have
+        no row yet, and stay undercounted until rebuild_tag_stats runs.
+        """
+        tag_ids = list(tag_ids)
+        if not tag_ids:
+            return
+        self.bulk_create([TagStat(tag_id=tag_id) for tag_id in tag_ids], ignore_conflicts=True)
+        self.filter(tag_id__in=tag_ids).update(post_count=Greatest(F('post_count') + delta, 0))
+        cache.delete(TagStat.CLOUD_CACHE_KEY)
+
+    def rebuild(self):
+        """
+        Recount every tag from taggit's tables, e.g. after adding TagStat
+        to a blog that already has tagged posts (see rebuild_tag_stats).
+        """
+        counts = Tag.objects.filter(
+            taggit_taggeditem_items__content_type__app_label='blog',
+            taggit_taggeditem_items__content_type__model='post',
+        ).annotate(post_count=Count('taggit_taggeditem_items'))
+        self.all().delete()
+        self.bulk_create(TagStat(tag_id=tag.pk, post_count=tag.post_count) for tag in counts)
+        cache.delete(TagStat.CLOUD_CACHE_KEY)
+
+class TagStat(models.Model):
+    """
+    Number of posts carrying each tag, maintained from the Post.tags
+    signals below so tag pages and the tag cloud never count taggit rows.
+    """
+    CLOUD_CACHE_KEY = 'blog:tag-cloud'
+
+    tag = models.OneToOneField(Tag, on_delete=models.CASCADE, primary_key=True, related_name='stat')
+    post_count = models.PositiveIntegerField(default=0)
+
+    objects = TagStatQuerySet.as_manager()
+
+    class Meta:
+        indexes = [models.Index(fields=['-post_count'], name='tagstat_post_count_idx')]
+
+    def __str__(self):
+        return f'{self.tag}: {self.post_count}'
+
+@receiver(post_save, sender=Comment)
+def count_new_comment(sender, instance, created, **kwargs):
+    if created:
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=F('comment_count') + 1, last_comment_at=instance.created_at, updated_at=timezone.now(),
+        )
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance, **kwargs):
+    latest = Comment.objects.filter(post=OuterRef('pk')).order_by('-created_at').values('created_at')[:1]
+    Post.objects.filter(pk=instance.post_id, comment_count__gt=0).update(
+        comment_count=F('comment_count') - 1, last_comment_at=Subquery(latest), updated_at=timezone.now(),
+    )
+
+# Keep the full-text index (see blog.search) in step with posts and tags.
+@receiver(post_save, sender=Post)
+def index_post(sender, instance, **kwargs):
+    search.index_posts([instance.pk])
+
+@receiver(post_delete, sender=Post)
+def unindex_post(sender, instance, **kwargs):
+    search.unindex_posts([instance.pk])
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def reindex_retagged_posts(sender, instance, action, reverse, pk_set, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        search.index_posts((pk_set or []) if reverse else [instance.pk])
+
+@receiver(post_save, sender=Tag)
+def reindex_renamed_tag(sender, instance, created, **kwargs):
+    if not created:
+        search.index_posts(Post.objects.filter(tags=instance).values_list('pk', flat=True))
+
+@receiver(post_delete, sender=TaggedItem)
+def reindex_untagged_post(sender, instance, **kwargs):
+    # Deleting a tag removes its TaggedItems without an m2m_changed signal.
+    if instance.content_type_id == search.post_content_type_id():
+        search.index_posts([instance.object_id])
+
+# Keep TagStat in step with post tags.
+@receiver(m2m_changed, sender=Post.tags.through)
+def count_post_tags(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse:
+        # instance is a Tag and pk_set holds post ids.
+        if action in ('post_add', 'post_remove') and pk_set:
+            TagStat.objects.adjust([instance.pk], len(pk_set) if action == 'post_add' else -len(pk_set))
+    elif action == 'post_add':
+        TagStat.objects.adjust(pk_set, 1)
+    elif action == 'post_remove':
+        TagStat.objects.adjust(pk_set, -1)
+    elif action == 'pre_clear':
+        instance._cleared_tag_ids = list(instance.tags.values_list('pk', flat=True))
+    elif action == 'post_clear':
+        TagStat.objects.adjust(getattr(instance, '_cleared_tag_ids', []), -1)
+
+@receiver(post_delete, sender=Tag)
+def forget_deleted_tag(sender, instance, **kwargs):
+    # Its TagStat row cascades away; drop the cloud still linking to it.
+    cache.delete(TagStat.CLOUD_CACHE_KEY)
+
+@receiver(pre_delete, sender=Post)
+def uncount_deleted_post_tags(sender, instance, **kwargs):
+    # The post's tagged items go with it, without an m2m_changed signal.
+    TagStat.objects.adjust(instance.tags.values_list('pk', flat=True), -1)
+
+# Bump updated_at, and so retire cached cards (see blog.cards), when what a
+# card shows changes outside the post row.
+@receiver(m2m_changed, sender=Post.tags.through)
+def touch_retagged_posts(sender, instance, action, reverse, pk_set, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        Post.objects.filter(pk__in=(pk_set or []) if reverse else [instance.pk]).touch()
+
+@receiver(post_save, sender=Tag)
+def touch_renamed_tag_posts(sender, instance, created, **kwargs):
+    if not created:
+        Post.objects.filter(tags=instance).touch()
+
+@receiver(post_delete, sender=TaggedItem)
+def touch_untagged_post(sender, instance, **kwargs):
+    if instance.content_type_id == search.post_content_type_id():
+        Post.objects.filter(pk=instance.object_id).touch()
+
+@receiver(post_save, sender=User)
+def touch_renamed_author_posts(sender, instance, created, update_fields=None, **kwargs):
+    if not created and (update_fields is None or 'username' in update_fields):
+        Post.objects.filter(author=instance).touch()
@@ -0,0 +1,193 @@
+"""
+Full-text search over blog posts, backed by an SQLite FTS5 table holding
+each post's title, content and tag names (rowid is the post id).
+
+The index is kept current by the receivers in blog.models and created, and
+filled from the existing posts, the first time it is needed, since the app
+ships without migrations; the rebuild_post_search command rebuilds it. Searches are ranked with bm25 and return
+highlighted snippets. On other databases search() falls back to
+``icontains`` matching.
+"""
+import re
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+SEARCH_TABLE = 'blog_post_search'
+# bm25() column weights for title, content and tags.
+TITLE_WEIGHT = 3.0
+CONTENT_WEIGHT = 1.0
+TAGS_WEIGHT = 2.0
+# Snippet length in tokens, and the markers FTS5 puts around matches. The
+# markers are control characters so the snippet can be escaped before
+# they are turned into <mark> tags.
+SNIPPET_TOKENS = 24
+MATCH_START, MATCH_END = '\x02', '\x03'
+# Keep IN (...) lists well under SQLite's bound-parameter limit.
+CHUNK_SIZE = 500
+
+_ready = set()
+
+
+def search_available():
+    return connection.vendor == 'sqlite'
+
+
+def build_match_query(terms):
+    """
+    Turn search terms into an FTS5 MATCH expression: every term must match
+    as a token prefix.
+    """
+    tokens = []
+    for term in terms:
+        if re.search(r'\w', term):
+            tokens.append('"%s"*' % term.replace('"', '""'))
+    return ' AND '.join(tokens)
+
+
+def post_content_type_id():
+    from .models import Post
+    return ContentType.objects.get_for_model(Post).id
+
+
+def _select_posts(where=''):
+    # Tag names are folded into one space-separated column.
+    return (
+        'SELECT post.id, post.title, post.content, ('
+        'SELECT group_concat(tag.name, \' \') FROM taggit_taggeditem item '
+        'JOIN taggit_tag tag ON tag.id = item.tag_id '
+        'WHERE item.object_id = post.id AND item.content_type_id = %%s'
+        ') FROM blog_post post %s' % where
+    )
+
+
+def create_index():
+    """
+    Create the index table unless it exists, and return whether it was
+    missing. Safe when another process creates it at the same time.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [SEARCH_TABLE])
+        missing = cursor.fetchone() is None
+        cursor.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS %s USING fts5(title, content, tags, tokenize='unicode61')"
+            % SEARCH_TABLE
+        )
+    _ready.add(connection.alias)
+    return missing
+
+
+def ensure_index():
+    """
+    Create and fill the index if this database does not have it yet. Only
+    checked once per process; rebuild_post_search restores an index lost
+    or stale after that.
+    """
+    if connection.alias in _ready:
+        return
+    if create_index():
+        rebuild_index()
+
+
+def index_posts(post_ids):
+    """
+    (Re)index the given posts from their current rows and tags.
+    """
+    if not search_available():
+        return
+    ensure_index()
+    post_ids = list(post_ids)
+    content_type_id = post_content_type_id()
+    with connection.cursor() as cursor:
+        for start in range(0, len(post_ids), CHUNK_SIZE):
+            chunk = post_ids[start:start + CHUNK_SIZE]
+            placeholders = ', '.join(['%s'] * len(chunk))
+            cursor.execute('DELETE FROM %s WHERE rowid IN (%s)' % (SEARCH_TABLE, placeholders), chunk)
+            cursor.execute(
+                'INSERT INTO %s (rowid, title, content, tags) %s' % (
+                    SEARCH_TABLE, _select_posts('WHERE post.id IN (%s)' % placeholders),
+                ),
+                [content_type_id, *chunk],
+            )
+
+
+def unindex_posts(post_ids):
+    """
+    Remove the given posts from the index.
+    """
+    if not search_available():
+        return
+    ensure_index()
+    post_ids = list(post_ids)
+    with connection.cursor() as cursor:
+        for start in range(0, len(post_ids), CHUNK_SIZE):
+            chunk = post_ids[start:start + CHUNK_SIZE]
+            placeholders = ', '.join(['%s'] * len(chunk))
+            cursor.execute('DELETE FROM %s WHERE rowid IN (%s)' % (SEARCH_TABLE, placeholders), chunk)
+
+
+def rebuild_index():
+    """
+    Rebuild the whole index from the posts and return the number indexed.
+    """
+    if not search_available():
+        return 0
+    create_index()
+    with connection.cursor() as cursor:
+        cursor.execute('DELETE FROM %s' % SEARCH_TABLE)
+        cursor.execute(
+            'INSERT INTO %s (rowid, title, content, tags) %s' % (SEARCH_TABLE, _select_posts()),
+            [post_content_type_id()],
+        )
+        count = cursor.rowcount
+        cursor.execute("INSERT INTO %s (%s) VALUES ('optimize')" % (SEARCH_TABLE, SEARCH_TABLE))
+    return count
+
+
+def search(queryset, query):
+    """
+    Filter a Post queryset down to the posts matching ``query``, best
+    matches first. Matches are annotated with ``search_rank`` (bm25, lower
+    is better) and ``search_snippet`` (see highlight()).
+    """
+    terms = query.split()
+    if not search_available():
+        condition = Q()
+        for term in terms:
+            condition &= Q(title__icontains=term) | Q(content__icontains=term) | Q(tags__name__icontains=term)
+        return queryset.filter(condition).distinct().order_by('-published_date', '-id')
+
+    match = build_match_query(terms)
+    if not match:
+        return queryset.none()
+    ensure_index()
+    table = queryset.model._meta.db_table
+    matches = RawSQL('SELECT rowid FROM %s WHERE %s MATCH %%s' % (SEARCH_TABLE, SEARCH_TABLE), [match])
+    rank = RawSQL(
+        'SELECT bm25(%s, %s, %s, %s) FROM %s WHERE %s MATCH %%s AND rowid = "%s"."id"' % (
+            SEARCH_TABLE, TITLE_WEIGHT, CONTENT_WEIGHT, TAGS_WEIGHT, SEARCH_TABLE, SEARCH_TABLE, table,
+        ),
+        [match],
+    )
+    snippet = RawSQL(
+        "SELECT snippet(%s, -1, char(2), char(3), '…', %d) FROM %s WHERE %s MATCH %%s AND rowid = \"%s\".\"id\"" % (
+            SEARCH_TABLE, SNIPPET_TOKENS, SEARCH_TABLE, SEARCH_TABLE, table,
+        ),
+        [match],
+    )
+    return queryset.filter(pk__in=matches).annotate(search_rank=rank, search_snippet=snippet).order_by(
+        'search_rank', '-id',
+    )
+
+
+def highlight(snippet):
+    """
+    Escape a raw FTS5 snippet and wrap its matches in <mark> tags.
+    """
+    if not snippet:
+        return ''
+    return mark_safe(escape(snippet).replace(MATCH_START, '<mark>').replace(MATCH_END, '</mark>'))
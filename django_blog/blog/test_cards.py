@@ -0,0 +1,69 @@
+from django.contrib.auth.models import User
+from taggit.models import Tag
+from .cards import attach_cards
+from .models import Comment, Post
+from .testing import BlogTestCase
+
+class PostCardTests(BlogTestCase):
+    """
+    Tests that cached post cards are retired when what they show changes.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='writer', password='testpassword')
+        cls.post = Post.objects.create(title='Post', content='Content', author=cls.user)
+
+    def card(self):
+        post = Post.objects.select_related('author').get(pk=self.post.pk)
+        attach_cards([post])
+        return post.card
+
+    def test_card_is_cached(self):
+        """
+        Ensure an unchanged post's card is served from the cache.
+        """
+        self.card()
+        with self.assertNumQueries(1):
+            self.card()
+
+    def test_post_edit(self):
+        """
+        Ensure editing the post retires its card.
+        """
+        self.assertIn('Post', self.card())
+        self.post.title = 'Edited'
+        self.post.save()
+        self.assertIn('Edited', self.card())
+
+    def test_comments(self):
+        """
+        Ensure adding or deleting a comment retires the card.
+        """
+        self.assertIn('0 comments', self.card())
+        comment = Comment.objects.create(post=self.post, author=self.user, content='Hi')
+        self.assertIn('1 comment,', self.card())
+        comment.delete()
+        self.assertIn('0 comments', self.card())
+
+    def test_tags(self):
+        """
+        Ensure tagging, renaming and deleting a tag retire the card.
+        """
+        self.assertNotIn('Tags:', self.card())
+        self.post.tags.add('django')
+        self.assertIn('>django</a>', self.card())
+        tag = Tag.objects.get(name='django')
+        tag.name = 'Django'
+        tag.save()
+        self.assertIn('>Django</a>', self.card())
+        tag.delete()
+        self.assertNotIn('Tags:', self.card())
+
+    def test_author_rename(self):
+        """
+        Ensure renaming the author retires the card.
+        """
+        self.assertIn('By writer', self.card())
+        self.user.username = 'author'
+        self.user.save()
+        self.assertIn('By author', self.card())
@@ -0,0 +1,79 @@
+from io import StringIO
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db.models.signals import post_save
+from django.test import override_settings
+from .models import Comment, Post, count_new_comment
+from .testing import BlogTestCase
+from .views import PostDetailView
+
+class CommentCountTests(BlogTestCase):
+    """
+    Tests for Post.comment_count and last_comment_at and the paginated
+    comments on the post page.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='writer', password='testpassword')
+        cls.post = Post.objects.create(title='Post', content='Content', author=cls.user)
+
+    def comment(self, content):
+        return Comment.objects.create(post=self.post, author=self.user, content=content)
+
+    def test_create_and_delete(self):
+        """
+        Ensure the count and latest comment time follow comments being
+        added and removed.
+        """
+        first = self.comment('First')
+        second = self.comment('Second')
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.comment_count, self.post.last_comment_at), (2, second.created_at))
+        second.delete()
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.comment_count, self.post.last_comment_at), (1, first.created_at))
+        first.delete()
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.comment_count, self.post.last_comment_at), (0, None))
+
+    def test_edit_does_not_count(self):
+        """
+        Ensure editing a comment does not count it again.
+        """
+        comment = self.comment('First')
+        comment.content = 'Edited'
+        comment.save()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 1)
+
+    @override_settings(BLOG_COMMENTS_PER_PAGE=2)
+    def test_comment_pages(self):
+        """
+        Ensure comments are paginated over the stored count, in either order.
+        """
+        comments = [self.comment('Comment %d' % i) for i in range(5)]
+        path = '/post/%d/' % self.post.pk
+        response = self.get_view(PostDetailView, path, {'page': 3}, pk=self.post.pk)
+        page = response.context_data['comment_page']
+        self.assertEqual((page.paginator.count, page.paginator.num_pages), (5, 3))
+        self.assertEqual(list(page), comments[4:])
+        response = self.get_view(PostDetailView, path, {'order': 'newest'}, pk=self.post.pk)
+        self.assertEqual(list(response.context_data['comment_page']), comments[:2:-1])
+
+    def test_uncounted_comments(self):
+        """
+        Ensure comments made before the counters existed are still listed,
+        and rebuild_comment_counts sets the counters from them.
+        """
+        post_save.disconnect(count_new_comment, sender=Comment)
+        try:
+            comments = [self.comment('Comment %d' % i) for i in range(3)]
+        finally:
+            post_save.connect(count_new_comment, sender=Comment)
+        response = self.get_view(PostDetailView, pk=self.post.pk)
+        self.assertEqual(list(response.context_data['comment_page']), comments)
+        out = StringIO()
+        call_command('rebuild_comment_counts', stdout=out)
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.comment_count, self.post.last_comment_at), (3, comments[-1].created_at))
+        self.assertIn('Counted comments for 1 posts.', out.getvalue())
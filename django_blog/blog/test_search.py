@@ -0,0 +1,101 @@
+from io import StringIO
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from taggit.models import Tag
+from . import search
+from .models import Post
+from .testing import BlogTestCase
+from .views import SearchResultsView
+
+class PostSearchTests(BlogTestCase):
+    """
+    Tests for the FTS5-backed post search.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='writer', password='testpassword')
+        cls.titled = Post.objects.create(title='Gardening', content='Notes on soil.', author=cls.user)
+        cls.mentioned = Post.objects.create(title='Weekend', content='Some gardening, mostly rain.', author=cls.user)
+        cls.other = Post.objects.create(title='Cooking', content='<b>Bread</b> & butter.', author=cls.user)
+
+    def search(self, query):
+        return list(search.search(Post.objects.all(), query))
+
+    def test_title_matches_rank_first(self):
+        """
+        Ensure a title match outranks a content match, and terms match as prefixes.
+        """
+        self.assertEqual(self.search('garden'), [self.titled, self.mentioned])
+        self.assertEqual(self.search('garden rain'), [self.mentioned])
+
+    def test_tags_are_searchable(self):
+        """
+        Ensure tags are indexed, and the index follows retagging, renaming
+        and deleting a tag.
+        """
+        self.other.tags.add('baking')
+        self.assertEqual(self.search('baking'), [self.other])
+        tag = Tag.objects.get(name='baking')
+        tag.name = 'pastry'
+        tag.save()
+        self.assertEqual(self.search('baking'), [])
+        self.assertEqual(self.search('pastry'), [self.other])
+        tag.delete()
+        self.assertEqual(self.search('pastry'), [])
+        self.titled.tags.add('outdoors')
+        self.titled.tags.clear()
+        self.assertEqual(self.search('outdoors'), [])
+
+    def test_edited_and_deleted_posts(self):
+        """
+        Ensure edits are reindexed and deleted posts leave the index.
+        """
+        self.other.title = 'Baking'
+        self.other.save()
+        self.assertEqual(self.search('baking'), [self.other])
+        self.other.delete()
+        self.assertEqual(self.search('baking'), [])
+
+    def test_query_syntax_is_escaped(self):
+        """
+        Ensure FTS5 operators and quotes in the query are matched as text.
+        """
+        self.assertEqual(self.search('"gardening'), [self.titled, self.mentioned])
+        self.assertEqual(self.search('gardening OR cooking'), [])
+        self.assertEqual(self.search('" * ( )'), [])
+
+    def test_snippet_is_escaped(self):
+        """
+        Ensure the highlighted snippet escapes the post's HTML.
+        """
+        post = search.search(Post.objects.all(), 'bread').get()
+        self.assertEqual(search.highlight(post.search_snippet), '&lt;b&gt;<mark>Bread</mark>&lt;/b&gt; &amp; butter.')
+
+    @override_settings(BLOG_POSTS_PER_PAGE=2)
+    def test_results_pages(self):
+        """
+        Ensure results are paginated in rank order with highlighted excerpts.
+        """
+        extra = [Post.objects.create(title='Gardening %d' % i, content='More', author=self.user) for i in range(3)]
+        seen = []
+        for page in (1, 2, 3):
+            response = self.get_view(SearchResultsView, data={'q': 'gardening', 'page': page})
+            posts = response.context_data['posts']
+            self.assertRegex(posts[0].card, '(?i)<mark>gardening</mark>')
+            seen.extend(posts)
+        self.assertEqual(response.context_data['paginator'].count, 5)
+        self.assertEqual(seen, [*reversed(extra), self.titled, self.mentioned])
+
+    def test_rebuild_command(self):
+        """
+        Ensure rebuild_post_search restores a dropped index.
+        """
+        self.assertEqual(self.search('gardening'), [self.titled, self.mentioned])
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TABLE %s' % search.SEARCH_TABLE)
+        out = StringIO()
+        call_command('rebuild_post_search', stdout=out)
+        self.assertIn('Indexed 3 posts.', out.getvalue())
+        self.assertEqual(self.search('gardening'), [self.titled, self.mentioned])
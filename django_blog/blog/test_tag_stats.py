@@ -0,0 +1,93 @@
+from io import StringIO
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings
+from taggit.models import Tag
+from .context_processors import build_tag_cloud
+from .models import Post, TagStat
+from .testing import BlogTestCase
+from .views import PostByTagListView
+
+class TagStatTests(BlogTestCase):
+    """
+    Tests for the per-tag post counts kept by the Post.tags receivers.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='writer', password='testpassword')
+        cls.first = Post.objects.create(title='First', content='One', author=cls.user)
+        cls.second = Post.objects.create(title='Second', content='Two', author=cls.user)
+
+    def counts(self):
+        return dict(TagStat.objects.values_list('tag__name', 'post_count'))
+
+    def test_add_set_remove_clear(self):
+        """
+        Ensure counts follow tags being added, replaced, removed and cleared.
+        """
+        self.first.tags.add('django', 'python')
+        self.second.tags.add('django')
+        self.assertEqual(self.counts(), {'django': 2, 'python': 1})
+        self.first.tags.set(['python', 'sqlite'])
+        self.assertEqual(self.counts(), {'django': 1, 'python': 1, 'sqlite': 1})
+        self.first.tags.remove('python')
+        self.assertEqual(self.counts(), {'django': 1, 'python': 0, 'sqlite': 1})
+        self.first.tags.clear()
+        self.assertEqual(self.counts(), {'django': 1, 'python': 0, 'sqlite': 0})
+
+    def test_post_delete(self):
+        """
+        Ensure deleting a post uncounts its tags.
+        """
+        self.first.tags.add('django', 'python')
+        self.second.tags.add('django')
+        self.first.delete()
+        self.assertEqual(self.counts(), {'django': 1, 'python': 0})
+
+    def test_tag_delete(self):
+        """
+        Ensure deleting a tag drops its count and the cached cloud.
+        """
+        self.first.tags.add('django', 'python')
+        self.assertEqual(len(cache.get_or_set(TagStat.CLOUD_CACHE_KEY, build_tag_cloud)), 2)
+        Tag.objects.get(name='python').delete()
+        self.assertEqual(self.counts(), {'django': 1})
+        self.assertIsNone(cache.get(TagStat.CLOUD_CACHE_KEY))
+
+    def test_count_change_clears_cloud(self):
+        """
+        Ensure the cached cloud is rebuilt once a count changes.
+        """
+        self.first.tags.add('django')
+        self.assertEqual(cache.get_or_set(TagStat.CLOUD_CACHE_KEY, build_tag_cloud)[0]['count'], 1)
+        self.second.tags.add('django')
+        self.assertEqual(cache.get_or_set(TagStat.CLOUD_CACHE_KEY, build_tag_cloud)[0]['count'], 2)
+
+    def test_uncounted_tags_stay_at_zero(self):
+        """
+        Ensure tags counted before TagStat existed are not decremented below
+        zero, and rebuild_tag_stats recounts them.
+        """
+        self.first.tags.add('django')
+        self.second.tags.add('django', 'python')
+        TagStat.objects.all().delete()
+        self.second.tags.remove('python')
+        self.first.delete()
+        self.assertEqual(self.counts(), {'django': 0, 'python': 0})
+        out = StringIO()
+        call_command('rebuild_tag_stats', stdout=out)
+        self.assertEqual(self.counts(), {'django': 1})
+        self.assertIn('Counted posts for 1 tags.', out.getvalue())
+
+    @override_settings(BLOG_POSTS_PER_PAGE=1)
+    def test_tag_page_count(self):
+        """
+        Ensure the tag page paginates over the stored count.
+        """
+        self.first.tags.add('django')
+        self.second.tags.add('django')
+        response = self.get_view(PostByTagListView, tag_slug='django')
+        paginator = response.context_data['paginator']
+        self.assertEqual((paginator.count, paginator.num_pages), (2, 2))
+        self.assertEqual(list(response.context_data['posts']), [self.second])
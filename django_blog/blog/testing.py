@@ -0,0 +1,32 @@
+"""
+Test helpers for the blog app.
+"""
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+
+from . import search
+
+
+class BlogTestCase(TestCase):
+    """
+    TestCase starting every test with an empty cache and with the search
+    index looked up again: it is created lazily inside the test
+    transaction, so a rolled-back test takes it along while the module
+    still remembers it as ready.
+    """
+    @classmethod
+    def setUpClass(cls):
+        search._ready.clear()
+        super().setUpClass()
+
+    def setUp(self):
+        search._ready.clear()
+        cache.clear()
+
+    def get_view(self, view_class, path='/', data=None, **kwargs):
+        """
+        Run ``view_class`` for a GET of ``path`` and return the response,
+        unrendered, so its ``context_data`` can be inspected.
+        """
+        request = RequestFactory().get(path, data or {})
+        return view_class.as_view()(request, **kwargs)
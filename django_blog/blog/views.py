@@ -1,13 +1,16 @@
+from django.conf import settings
+from django.core.paginator import Paginator
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import login
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
 from django.urls import reverse_lazy
-from django.db.models import Q
 from taggit.models import Tag
 from .forms import CustomUserCreationForm, CommentForm, PostForm
 from .models import Post, Comment
+from . import search
+from .cards import attach_cards
 
 def post_list(request):
     return render(request, 'blog/post_list.html', {})
@@ -28,17 +31,55 @@ def profile(request):
     return render(request, 'blog/profile.html')
 
 class PostListView(ListView):
+    """
+    Newest posts first, BLOG_POSTS_PER_PAGE to a page. Authors are joined
+    and each post is shown through its cached card (see blog.cards), so
+    the page costs the same few queries however many posts the blog has.
+    """
     model = Post
     template_name = 'blog/post_list.html'
     context_object_name = 'posts'
-    ordering = ['-published_date']
+    # id breaks ties between posts published at the same instant, so
+    # pages neither repeat nor skip posts.
+    ordering = ['-published_date', '-id']
+
+    def get_paginate_by(self, queryset):
+        return getattr(settings, 'BLOG_POSTS_PER_PAGE', 10)
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('author')
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        attach_cards(context['posts'])
+        return context
 
 class PostDetailView(DetailView):
+    """
+    A post with one page of its comments (BLOG_COMMENTS_PER_PAGE), oldest
+    first or newest first with ?order=newest. Comment authors are joined,
+    and the paginator takes its count from Post.comment_count. A zero count
+    is still checked with a query, since it may predate the counter (see
+    rebuild_comment_counts).
+    """
     model = Post
+    comment_orderings = {'oldest': ['created_at', 'id'], 'newest': ['-created_at', '-id']}
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('author').prefetch_related('tags')
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['comment_form'] = CommentForm()
+        order = self.request.GET.get('order')
+        if order not in self.comment_orderings:
+            order = 'oldest'
+        comments = self.object.comments.select_related('author').order_by(*self.comment_orderings[order])
+        paginator = Paginator(comments, getattr(settings, 'BLOG_COMMENTS_PER_PAGE', 50))
+        if self.object.comment_count:
+            paginator.count = self.object.comment_count
+        context['comment_page'] = paginator.get_page(self.request.GET.get('page'))
+        context['comment_order'] = order
         return context
 
 class PostCreateView(LoginRequiredMixin, CreateView):
@@ -103,22 +144,61 @@ class CommentDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
         return reverse_lazy('post-detail', kwargs={'pk': self.object.post.pk})
 
 class PostByTagListView(ListView):
+    """
+    Posts carrying one tag, newest first, BLOG_POSTS_PER_PAGE to a page.
+    The paginator's total comes from TagStat instead of a count query, and
+    posts are shown through their cached cards (see blog.cards).
+    """
     model = Post
     template_name = 'blog/tagged_post_list.html'
     context_object_name = 'posts'
 
+    def get_paginate_by(self, queryset):
+        return getattr(settings, 'BLOG_POSTS_PER_PAGE', 10)
+
     def get_queryset(self):
-        return Post.objects.filter(tags__slug=self.kwargs['tag_slug'])
+        self.tag = get_object_or_404(Tag.objects.select_related('stat'), slug=self.kwargs['tag_slug'])
+        return (
+            Post.objects.filter(tags=self.tag).select_related('author').order_by('-published_date', '-id')
+        )
+
+    def get_paginator(self, *args, **kwargs):
+        paginator = super().get_paginator(*args, **kwargs)
+        stat = getattr(self.tag, 'stat', None)
+        if stat is not None:
+            paginator.count = stat.post_count
+        return paginator
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['tag'] = self.tag
+        attach_cards(context['posts'])
+        return context
 
 class SearchResultsView(ListView):
+    """
+    Posts matching ?q= over title, content and tags, best matches first,
+    BLOG_POSTS_PER_PAGE to a page, each shown through its cached card with
+    a highlighted snippet as the excerpt (see blog.search and blog.cards).
+    """
     model = Post
     template_name = 'blog/search_results.html'
     context_object_name = 'posts'
 
+    def get_paginate_by(self, queryset):
+        return getattr(settings, 'BLOG_POSTS_PER_PAGE', 10)
+
     def get_queryset(self):
         query = self.request.GET.get('q')
         if query:
-            return Post.objects.filter(
-                Q(title__icontains=query) | Q(content__icontains=query) | Q(tags__name__icontains=query)
-            ).distinct()
+            return search.search(Post.objects.select_related('author'), query)
         return Post.objects.none()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        posts = context['posts']
+        excerpts = None
+        if search.search_available():
+            excerpts = {post.pk: search.highlight(post.search_snippet) for post in posts}
+        attach_cards(posts, excerpts)
+        return context
@@ -64,6 +64,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'blog.context_processors.tag_cloud',
             ],
         },
     },
@@ -126,3 +127,18 @@ STATICFILES_DIRS = [BASE_DIR / "static"]
 # https://docs.djangoproject.com/en/4.0/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Posts per page on the blog front page.
+BLOG_POSTS_PER_PAGE = 10
+
+# Comments per page on a post.
+BLOG_COMMENTS_PER_PAGE = 50
+
+# Tags shown in the tag cloud, and how long it is cached (it is also
+# cleared whenever a tag's post count changes).
+BLOG_TAG_CLOUD_SIZE = 30
+BLOG_TAG_CLOUD_TIMEOUT = 3600
+
+# How long rendered post cards stay cached. Keys change whenever a post
+# changes, so this only bounds how long stale cards linger.
+BLOG_POST_CARD_TIMEOUT = 86400